@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+# This script, not the .ipynb next to it, is the maintained source of the
+# analysis. It was exported from the notebook and now uses the app_profiles
+# package; the notebook is the original run, kept for its outputs.
+
 # # Profitable App Profiles
 #    
 #    For this project we will be focusing on building apps that are avaliable in Google Play Store and Apple Store. We will focus our interest in building apps that are free to downlad. Our main source of revenue would be the in-app ads. This means the more users the app will have, the better the revenue. One of our goals is to find out what type of apps would be worth developing in order to have a bigger target audience. Analysing data from two csv files should help us understand what type of apps are likely to attract more users. 
@@ -12,24 +16,42 @@
 # A data set containing data about approximately ten thousand Android apps from Google Play. You can download the data set directly from [this link](https://dq-content.s3.amazonaws.com/350/googleplaystore.csv).
 # A data set containing data about approximately seven thousand iOS apps from the App Store. You can download the data set directly from [this link](https://dq-content.s3.amazonaws.com/350/AppleStore.csv).
 # 
-# Let's start by opening the two data sets and then continue with exploring the data.
+# Let's start by opening the two data sets and then continue with exploring the data. stream_rows() reads a csv file row by row and closes it once every row has been read, and split_header() separates the header from the rest of the rows. For the exploration below we keep the rows in lists; the clean_android() and clean_ios() functions of the app_profiles package run the same cleaning steps without ever holding a whole file in memory.
 
 # In[2]:
 
 
-from csv import reader 
-
-opened_file = open('googleplaystore.csv',encoding='utf8')
-read_file = reader(opened_file)
-android = list(read_file)
-android_header = android[0]
-android = android[1:]
-
-opened_file = open('AppleStore.csv', encoding='utf8')
-read_file = reader(opened_file)
-ios = list(read_file)
-ios_header = ios[0]
-ios = ios[1:]
+from app_profiles import (
+    ANDROID_SCHEMA,
+    IOS_SCHEMA,
+    AndroidApp,
+    AppIndex,
+    AppTable,
+    GenreIndex,
+    IosApp,
+    android_rules,
+    as_records,
+    clean_plan,
+    deduplicate,
+    display_table,
+    group_aggregate,
+    group_quantiles,
+    instrumentation,
+    ios_rules,
+    keep_english,
+    keep_free,
+    popularity,
+    result_cache,
+    split_header,
+    stream_rows,
+    validate_rows,
+)
+
+android_header, android = split_header(stream_rows('googleplaystore.csv'))
+android = list(android)
+
+ios_header, ios = split_header(stream_rows('AppleStore.csv'))
+ios = list(ios)
 
 
 
@@ -84,14 +106,21 @@ print('\n')
 print(android[0])      # correct row
 
 
-# The row 10472 corresponds to the app Life Made WI-Fi Touchscreen Photo Frame, and we can see that the rating is 19. This is clearly off because the maximum rating for a Google Play app is 5. As a consequence, we'll delete this row.
+# The row 10472 corresponds to the app Life Made WI-Fi Touchscreen Photo Frame, and we can see that the rating is 19. This is clearly off because the maximum rating for a Google Play app is 5. As a consequence, we'll delete this row. Instead of deleting it by its index (which is only safe to run once), validate_rows() checks every row against the header: the number of columns, and whether the ratings, review counts, installs and prices are numbers in a sensible range. Rows that fail are left out and collected in a separate list; validate_rows() can also write them, together with the reason they failed, to a quarantine csv file.
+# 
+# At the same time we turn each remaining row into an AndroidApp or IosApp record. A record can be indexed just like the list it came from (app[0] is still the name), but it takes much less memory: values that repeat across many apps, like the category, the genre or the number of installs, are stored only once and shared between all the apps that have them.
 
 # In[9]:
 
 
 print(len(android))
-#del(android[10472])  #we run this code only once
+android_bad = []
+android = list(as_records(
+    validate_rows(android, android_header, android_rules(), android_bad),
+    AndroidApp))
+ios = list(as_records(validate_rows(ios, ios_header, ios_rules()), IosApp))
 print(len(android))
+print(len(android_bad))
 
 
 # # Removing duplicate entries
@@ -111,57 +140,29 @@ for app in android:
         print(app)
 
 
-# Next we will look for all of the duplicate apss throughout the android data set:
+# Next we will look for all of the duplicate apss throughout the android data set. Rather than removing the duplicates randomly, we will take a look at the number of reviews of each duplicate and keep only the entry that has the highest number of reviews (assuming that that is the most recent entry, making the data more accurate).
+# 
+# Checking `name in unique_apps` against a list gets very slow on bigger data sets, so we use the deduplicate() function from our app_profiles package. In a single pass it remembers, for every app name, the entry with the highest number of reviews (column 3) and collects the names of the duplicates it sees along the way. When the highest number of reviews of a duplicate app is the same for more than one entry (for example, the Box app has three entries, and the number of reviews is the same), the first of those entries is kept, so we end up with exactly one entry per app.
 
 # In[11]:
 
 
-duplicate_apps = []
-unique_apps = []
+android_clean, duplicate_apps = deduplicate(android, 0, keep_by=3)
 
-for app in android:
-    name = app[0]
-    if name in unique_apps:
-        duplicate_apps.append(name)
-        
-    else:
-        unique_apps.append(name)
-
-    
 print('Number of duplicate apps:', len(duplicate_apps))
 print('\n')
 print('Examples of duplicate apps:', duplicate_apps[:15])
 
 
-# We can see from the code above that we have 1181 duplicate entries in the android data set. We would like to remove these entries, but rather than removing them randomly, we will take a look at the number of reviews of each duplicate and keep only the entry that has the highest number of reviews (assuming that that is the most recent entry, making the data more accurate. 
-# 
-# To do that, we will:
-# 
-# * Create a dictionary where each key is a unique app name, and the value is the highest number of reviews of that app
-# * Use the dictionary to create a new data set, which will have only one entry per app (and we only select the apps with the highest number of reviews)
-# 
-
-# ## Part two
-# 
-# Let's start by bulding the dictionary:
-# 
+# We can see from the code above that we have 1181 duplicate entries in the android data set. The reviews_max dictionary maps each unique app name to the highest number of reviews of that app:
 
 # In[12]:
 
 
 reviews_max = {}
 
-for app in android:
-    name = app[0]
-    n_reviews = float(app[3])
-    
-    if name in reviews_max and reviews_max[name] < n_reviews:
-        reviews_max[name] = n_reviews
-        
-    elif name not in reviews_max:
-            reviews_max[name] = n_reviews
-
-print(app)
+for app in android_clean:
+    reviews_max[app[0]] = float(app[3])
 
 
 # In[13]:
@@ -171,30 +172,6 @@ print('Expected length:', len(android) - 1181)
 print('Actual length:', len(reviews_max))
 
 
-# As we can see we have our expected length right, now we will go ahead and remove the duplicate data using the dictionary we created.
-# 
-# * First we will create two empty lists: android_clean and already_added
-# * We will loop through the data set (header excluded), and for each iteration we will:
-#     * We isolate the name of the app and the number of reviews.
-#     * We add the current row (app) to the android_clean list, and the app name (name) to the already_added list if:
-#         * The number of reviews of the current app matches the number of reviews of that app as described in the reviews_max dictionary; and
-#         * The name of the app is not already in the already_added list. We need to add this supplementary condition to account for those cases where the highest number of reviews of a duplicate app is the same for more than one entry (for example, the Box app has three entries, and the number of reviews is the same). If we just check for reviews_max[name] == n_reviews, we'll still end up with duplicate entries for some apps.
-
-# In[14]:
-
-
-android_clean = []
-already_added = []
-
-for app in android:
-    name = app[0]
-    n_reviews = float(app[3])
-
-    if (reviews_max[name] == n_reviews) and (name not in already_added):
-        android_clean.append(app)
-        already_added.append(name)
-
-
 # Now let's confirm that the number of rows is 9,659:
 
 # In[15]:
@@ -283,24 +260,14 @@ print(is_english('Instachat 😜'))
     
 
 
-# What we want to do next is use this newly built function to loop though both our data sets and filter out our English applications, the function is not perfect but for now we will not waste any more time on optimization.
+# What we want to do next is use this newly built function to loop though both our data sets and filter out our English applications, the function is not perfect but for now we will not waste any more time on optimization. The keep_english() generator applies the same rule (at most three non-ASCII characters) to the name column of every row.
 
 # In[20]:
 
 
-android_english = []
-ios_english = []
+android_english = list(keep_english(android_clean, 0))
+ios_english = list(keep_english(ios, 1))
 
-for app in android_clean:
-    name = app[0]
-    if is_english(name):
-        android_english.append(app)
-        
-for app in ios:
-    name = app[1]
-    if is_english(name):
-        ios_english.append(app)
-        
 explore_data(android_english, 0, 3, True)
 print('\n')
 explore_data(ios_english, 0, 3, True)
@@ -316,19 +283,14 @@ explore_data(ios_english, 0, 3, True)
 # In[21]:
 
 
-android_final = []
-ios_final = []
+android_final = AppTable.from_rows(
+    android_header, keep_free(android_english, 7, '0'), ANDROID_SCHEMA)
+ios_final = AppTable.from_rows(
+    ios_header, keep_free(ios_english, 4, '0.0'), IOS_SCHEMA)
 
-for app in android_english:
-    price = app[7]
-    if price == '0':
-        android_final.append(app)
+android_index = AppIndex(android_final, ['Category', 'Installs', 'Genres'])
+ios_index = AppIndex(ios_final, ['prime_genre'])
 
-for app in ios_english:
-    price = app[4]
-    if price == '0.0':
-        ios_final.append(app)
-        
 print(len(android_final))
 print(len(ios_final))
     
@@ -336,6 +298,20 @@ print(len(ios_final))
 
 
 # As we can see, now we are left with 8864 apps in the Android data set and 3222 apps in the iOS data set. This should be enough for our analysis. 
+# 
+# The free apps are stored in an AppTable rather than a list of lists. It converts every column once: numbers such as Reviews or rating_count_tot are parsed into arrays, and columns with only a few distinct values (Category, Installs, Genres, prime_genre, ...) are stored as small integer codes. We can still loop over it or index it like a list of rows.
+# 
+# Later on we will look at the apps of a single category or install tier many times. Rather than looping over all the apps every time, we build an AppIndex that remembers, for every category, install tier and genre, which rows hold it. Looking up the apps of a category with a given number of installs is then just an intersection of two sets of row numbers.
+
+# The same chain of cleaning steps can also be written as a lazy plan with clean_plan(). Nothing is read until the plan is iterated; then all filters run in one pass over the file, the cheap price check before the English check, and the English check, which only reads the app name, is pushed below the de-duplication. explain() shows the order the steps will run in.
+
+# In[ ]:
+
+
+print(clean_plan('googleplaystore.csv', 'android').explain())
+print()
+print(clean_plan('AppleStore.csv', 'ios').explain())
+
 
 # # Most Common Apps by genre
 # 
@@ -356,42 +332,7 @@ print(len(ios_final))
 # - One function to generate frequency tables that show percentages
 # - Another function that we can use to display the percentages in a descending order.
 # 
-
-# In[22]:
-
-
-def freq_table(dataset, index):
-    table = {}
-    total = 0
-    
-    for row in dataset:
-        total += 1
-        value = row[index]
-        if value in table:
-            table[value] += 1
-        else:
-            table[value] = 1
-            
-    table_percentages = {}
-    for key in table:
-        percentage = (table[key] / total) * 100
-        table_percentages[key] = percentage
-    
-    return table_percentages
-
-
-def display_table(dataset, index):
-    table = freq_table(dataset, index)
-    table_display = []
-    for key in table:
-        key_val_as_tuple = (table[key], key)
-        table_display.append(key_val_as_tuple)
-        
-    table_sorted = sorted(table_display, reverse=True)
-    for entry in table_sorted:
-        print(entry[1], ':', entry[0])
-    
-
+# freq_table() returns the percentage of rows for every value of a column and display_table() prints those percentages in descending order. Both come from the app_profiles package; on an AppTable they count the stored integer codes directly instead of looping over rows of strings. Their results, and those of group_aggregate(), are remembered for each version of a data set, so displaying a table and then asking for the same percentages again only counts the column once.
 
 # ## Part Three
 # 
@@ -424,6 +365,25 @@ display_table(android_final, 1) #Category
 display_table(android_final, 9) #Genres
 
 
+# Many values of the Genres column combine several genres, such as 'Art & Design;Pretend Play', which splits the apps of one genre over many rows of the table above. A GenreIndex splits every distinct combination once into a list of genre ids, so the share of apps listing each single genre, which genres are combined most often, and the average installs per genre all come without splitting the strings again. An app with several genres counts for each of them, so the percentages add up to more than 100.
+
+# In[ ]:
+
+
+genre_index = GenreIndex(android_final)
+single_genres = genre_index.freq_table()
+for genre in sorted(single_genres, key=single_genres.get, reverse=True)[:10]:
+    print(genre, ':', single_genres[genre])
+
+print()
+for (first, second), n_apps in list(genre_index.pairs().items())[:5]:
+    print(first, '+', second, ':', n_apps)
+
+print()
+installs_by_genre = genre_index.aggregate('n_installs')
+print('Pretend Play :', installs_by_genre['Pretend Play']['mean'])
+
+
 # We can see the Genres columns is much more granular, it consitsts of many more subgenres, so for our project we will be sticking with the Category column that paints the bigger picture. To this pont we found out that the App store is dominated by apps that are designed for entertainment, while the apps on the Google Play Store is much more balanced. Next, we'd like to get an idea about the kinds of apps that have the most users. 
 
 # # Most Popular Apps by Genre on the App Store
@@ -436,26 +396,16 @@ display_table(android_final, 9) #Genres
 # - sum up the user ratungs for the apps of that genre 
 # - divide the sum by the number of apps belonging to that genre (not the total number of apps)
 # 
-# For calculating the average number of user ratings for each genre, we'll use a for loop inside of a for loop **(nested loops)**
+# Instead of a for loop inside of a for loop **(nested loops)**, which goes through every app once for each genre, the group_aggregate() function adds up the sums and counts for all genres in a single pass.
 # 
 
 # In[26]:
 
 
-genres_ios = freq_table(ios_final, -5)
+ratings_by_genre = group_aggregate(ios_final, 'prime_genre', 'rating_count_tot')
 
-for genre in genres_ios:
-    total = 0
-    len_genre = 0 
-    for app in ios_final:
-        genre_app = app[-5]
-        if genre_app == genre:
-            n_ratings = float(app[5])
-            total += n_ratings
-            len_genre += 1
-    
-    avg_n_ratings = total / len_genre
-    print(genre, ':', avg_n_ratings)
+for genre in ratings_by_genre:
+    print(genre, ':', ratings_by_genre[genre]['mean'])
 
             
 
@@ -467,9 +417,21 @@ for genre in genres_ios:
 # In[27]:
 
 
-for app in ios_final:
-    if app[-5] == 'Navigation':
-        print(app[1], ':', app[5]) # print name and number of ratings
+for app in ios_index.rows({'prime_genre': 'Navigation'}):
+    print(app[1], ':', app[5]) # print name and number of ratings
+
+
+# The same check works for the App Store: for every genre popularity() names the apps whose number of ratings is far above the rest of the genre and averages the remaining apps:
+
+# In[ ]:
+
+
+ratings_popularity = popularity(ios_final, 'prime_genre', 'rating_count_tot',
+                                name_index='track_name')
+
+for genre in ratings_popularity:
+    stats = ratings_popularity[genre]
+    print(genre, ':', stats['robust_mean'], stats['outlier_names'][:3])
 
 
 # Social networking apps are also the ones with the most reviews, but in my opinion this genre is dominated by already very established social networks and to develop a social networking site that is new, unique and likely to catch up is not very probable, as over the years there have been so many social networks, but the only ones who managed to be relevant for users are Facebok, Instagram, Twitter and LinkedIn. In my opinion they are still relevant because each one of them is unique in it's own way and these companies have many employees. So in my opinion the best strategy would be to develop a game app that is likely to have a great number of users, or another option I would choose wolud be some kind of a productivity app with nice features and nice design that users would be likely to install and engage with. 
@@ -485,26 +447,15 @@ for app in ios_final:
 display_table(android_final, 5) #the Installs column
 
 
-# As we can see, these numbers don't seem too precise enough (most values are open- ended - 100+, 5000+, etc.). We wouldn't know if an app with 100.000+ installs has 100.000 installs, 200.000 instals or 350.000 installs. However, we don't need very precise data for our purposes - we only want to find out which app genres attract the most users, and we don't need perfect precision with respect to the number of users. We are going to leave the numbers as they are, which means that we'll consider that an app with 100.000+ installs has 100.000 installs and so on. To be able to perform computations, however, we'll need to convert each install number from ***string*** to ***float***, this means that we need to remove the commas and the plus characters. To remove characters form strings we can use the str.replace(old, new) method. 
+# As we can see, these numbers don't seem too precise enough (most values are open- ended - 100+, 5000+, etc.). We wouldn't know if an app with 100.000+ installs has 100.000 installs, 200.000 instals or 350.000 installs. However, we don't need very precise data for our purposes - we only want to find out which app genres attract the most users, and we don't need perfect precision with respect to the number of users. We are going to leave the numbers as they are, which means that we'll consider that an app with 100.000+ installs has 100.000 installs and so on. To be able to perform computations, however, we'll need to convert each install number from ***string*** to ***float***, this means that we need to remove the commas and the plus characters. To remove characters form strings we can use the str.replace(old, new) method. The AppTable does this once for every distinct install tier and keeps the result in its n_installs column.
 
 # In[34]:
 
 
-categories_android = freq_table(android_final, 1)
-
-for category in categories_android:
-    total = 0 
-    len_category = 0
-    for app in android_final:
-        category_app = app[1]
-        if category_app == category:
-            n_installs = app[5]
-            n_installs = n_installs.replace(',', '')
-            n_installs = n_installs.replace('+', '')
-            total += float(n_installs)
-            len_category += 1
-    avg_n_installs = total / len_category
-    print(category, ':', avg_n_installs)
+installs_by_category = group_aggregate(android_final, 'Category', 'n_installs')
+
+for category in installs_by_category:
+    print(category, ':', installs_by_category[category]['mean'])
             
 
 
@@ -513,29 +464,40 @@ for category in categories_android:
 # In[41]:
 
 
-for app in android_final:
-    if app[1] == 'COMMUNICATION' and (app[5] == '1,000,000,000+'
-                                     or app[5] == '500,000,000+'
-                                     or app[5] == '100,000,000+'):
-        print(app[0], ':', app[5])
+most_installed = ['1,000,000,000+', '500,000,000+', '100,000,000+']
 
+for app in android_index.rows({'Category': 'COMMUNICATION',
+                               'Installs': most_installed}):
+    print(app[0], ':', app[5])
 
-# If we removed all the communications apps that have over 100 million installs, the average would be reduced roughly ten times:
+
+# If we removed all the communications apps that have over 100 million installs, the average would be reduced roughly ten times. Rather than picking that threshold by hand for one category at a time, popularity() finds the outliers of every category on its own: an app is an outlier when its installs are more than three interquartile ranges above the upper quartile of its category. In one pass it also gives the median, a trimmed mean and robust_mean, the average without the outliers:
 # 
 
 # In[42]:
 
 
-under_100_m = []
+installs_popularity = popularity(android_final, 'Category', 'n_installs',
+                                 name_index='App')
+print(installs_popularity['COMMUNICATION']['outlier_names'])
+print()
 
-for app in android_final:
-    n_installs = app[5]
-    n_installs = n_installs.replace(',', '')
-    n_installs = n_installs.replace('+', '')
-    if (app[1] == 'COMMUNICATION') and (float(n_installs) < 100000000):
-        under_100_m.append(float(n_installs))
-        
-sum(under_100_m) / len(under_100_m)
+for category, stats in sorted(installs_popularity.items(),
+                              key=lambda item: item[1]['robust_mean'],
+                              reverse=True):
+    print(category, ':', stats['robust_mean'], stats['median'],
+          stats['outliers'])
+
+
+# popularity() keeps every install number of a category in memory to sort it. On much larger data sets, group_quantiles() gives the quartiles from a small sketch of the install numbers of each category instead, without keeping every number in memory:
+
+# In[ ]:
+
+
+installs_quartiles = group_quantiles(android_final, 'Category', 'n_installs')
+
+for category in installs_quartiles:
+    print(category, ':', installs_quartiles[category])
 
 
 # We could say the same about the video players category. The market is dominates by apps like Youtube, Google Play Movies, Netflix, etc. The pattern is also the same with the social apps ehere the market is dominated by giants like Facebook, Instagram, Twitter etc. The main concern is that these genres might seem more popular than they really are. And these genres seem to be dominated with giants that would be hard to compete against. 
@@ -549,9 +511,8 @@ sum(under_100_m) / len(under_100_m)
 # In[43]:
 
 
-for app in android_final:
-    if app[1] == 'BOOKS_AND_REFERENCE':
-        print(app[0], ':', app[5])
+for app in android_index.rows({'Category': 'BOOKS_AND_REFERENCE'}):
+    print(app[0], ':', app[5])
 
 
 # The Books and Reference genre seems to have a variety of different apps like libreries, dictionaries, tutorials on programming languages etc. But, it seems that there's still a small number of extremely popular apps that skew the average:
@@ -560,11 +521,9 @@ for app in android_final:
 # In[47]:
 
 
-for app in android_final:
-    if app[1] == 'BOOKS_AND_REFERENCE' and (app[5] == '1,000,000,000+'
-                                            or app[5] == '500,000,000+'
-                                            or app[5] == '100,000,000+'):
-        print(app[0], ':', app[5])
+for app in android_index.rows({'Category': 'BOOKS_AND_REFERENCE',
+                               'Installs': most_installed}):
+    print(app[0], ':', app[5])
 
 
 # It looks like it only has a few apps that have such popularity so this genre shows potential. 
@@ -575,9 +534,8 @@ for app in android_final:
 # In[48]:
 
 
-for app in android_final:
-    if app[1] == 'GAME':
-        print(app[0], ':', app[5])
+for app in android_index.rows({'Category': 'GAME'}):
+    print(app[0], ':', app[5])
 
 
 # The game market is definitely saturated, if we were to build a game app we would have to compete against some very popular apps, but I wouldn't dismiss the idea of building a game app just yet, if we were innovative enough it might be a profitable app genre to develop. Next, I would like to go ahead and look at the productity genre.
@@ -586,28 +544,18 @@ for app in android_final:
 # In[54]:
 
 
-for app in android_final:
-    if app[1] == 'PRODUCTIVITY':
-        print(app[0], ':', app[5])
+for app in android_index.rows({'Category': 'PRODUCTIVITY'}):
+    print(app[0], ':', app[5])
         
 
 
-# Let's explore the average for under 100 million installs for this genre so we can get an in-depth view of the genre's landscape:
+# Let's explore the average without the outliers for this genre so we can get an in-depth view of the genre's landscape:
 # 
 
 # In[55]:
 
 
-under_100_m_prod = []
-
-for app in android_final:
-    n_installs = app[5]
-    n_installs = n_installs.replace(',', '')
-    n_installs = n_installs.replace('+', '')
-    if (app[1] == 'PRODUCTIVITY') and (float(n_installs) < 100000000):
-        under_100_m_prod.append(float(n_installs))
-        
-sum(under_100_m_prod) / len(under_100_m_prod)
+installs_popularity['PRODUCTIVITY']['robust_mean']
 
 
 # This genre of apps would be a good candidate to look into for building apps, maybe a pproductivity app with a nice clean and minimal look that includes features like to-do, calendar, pomodoro clock, and an app that would be able to track the usage of apps on the phone it would be very profitable to build, even more so than the game genre. One last genre that we find interestinga and would like to look into would be the beauty genre, so let's go ahead and have a lok there before we draw our final conclusions
@@ -615,9 +563,19 @@ sum(under_100_m_prod) / len(under_100_m_prod)
 # In[58]:
 
 
-for app in android_final:
-    if app[1] == 'BEAUTY':
-        print(app[0], ':', app[5])
+for app in android_index.rows({'Category': 'BEAUTY'}):
+    print(app[0], ':', app[5])
+
+
+# If the script is run with the APP_PROFILES_INSTRUMENT environment variable set, every step of the app_profiles package records how long it took, how many rows went in and out and how much memory it used. Here is that report, followed by how many frequency tables and group averages were reused instead of recomputed:
+
+# In[ ]:
+
+
+if instrumentation.enabled:
+    for stage in instrumentation.report():
+        print(stage)
+    print(result_cache.info())
 
 
 # # Conclusions
@@ -0,0 +1,124 @@
+"""Reusable stages for the Profitable App Profiles analysis.
+
+Importing the package is cheap: the names below are only imported from
+their submodules the first time they are used, and no data set is read
+until a function that needs it is called.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'app_profiles.cache': ('cached_table', 'load_table', 'save_table'),
+    'app_profiles.dedup': ('deduplicate',),
+    'app_profiles.english': ('is_english', 'is_english_batch'),
+    'app_profiles.frequency': ('display_table', 'freq_table'),
+    'app_profiles.genres': ('GenreIndex',),
+    'app_profiles.groupby': ('group_aggregate',),
+    'app_profiles.incremental': ('IncrementalProfile',),
+    'app_profiles.index': ('AppIndex',),
+    'app_profiles.ingest': ('load_many', 'read_concurrently'),
+    'app_profiles.instrument': ('Instrumentation', 'instrumentation'),
+    'app_profiles.lazy': ('LazyDataset', 'Predicate', 'clean_plan'),
+    'app_profiles.load': ('ANDROID', 'IOS', 'clean_android', 'clean_ios',
+                          'drop_malformed', 'keep_english', 'keep_free',
+                          'split_header', 'stream_rows'),
+    'app_profiles.match': ('NameIndex', 'match_apps', 'normalize_name'),
+    'app_profiles.memo': ('ResultCache', 'result_cache'),
+    'app_profiles.parallel': ('profile_parallel',),
+    'app_profiles.parse': ('parse_column', 'parse_installs', 'parse_price',
+                           'price_equals'),
+    'app_profiles.quantiles': ('KLLSketch', 'group_quantiles'),
+    'app_profiles.records': ('AndroidApp', 'IosApp', 'Record', 'as_records'),
+    'app_profiles.report': ('Report', 'Section'),
+    'app_profiles.robust': ('popularity', 'summarize'),
+    'app_profiles.scan': ('ANDROID_COLUMNS', 'IOS_COLUMNS', 'scan_csv'),
+    'app_profiles.sketch': ('ApproximateCounter', 'CountMinSketch',
+                            'HyperLogLog'),
+    'app_profiles.table': ('ANDROID_SCHEMA', 'IOS_SCHEMA', 'AppTable',
+                           'Categorical'),
+    'app_profiles.validate': ('Quarantine', 'Rule', 'android_rules',
+                              'ios_rules', 'validate_rows'),
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items()
+              for name in names}
+
+__all__ = [
+    'ANDROID',
+    'ANDROID_COLUMNS',
+    'ANDROID_SCHEMA',
+    'IOS',
+    'IOS_COLUMNS',
+    'IOS_SCHEMA',
+    'AndroidApp',
+    'AppIndex',
+    'ApproximateCounter',
+    'AppTable',
+    'Categorical',
+    'CountMinSketch',
+    'GenreIndex',
+    'HyperLogLog',
+    'IncrementalProfile',
+    'Instrumentation',
+    'IosApp',
+    'KLLSketch',
+    'LazyDataset',
+    'NameIndex',
+    'Predicate',
+    'Quarantine',
+    'Record',
+    'Report',
+    'ResultCache',
+    'Rule',
+    'Section',
+    'android_rules',
+    'as_records',
+    'cached_table',
+    'clean_android',
+    'clean_ios',
+    'clean_plan',
+    'deduplicate',
+    'display_table',
+    'drop_malformed',
+    'freq_table',
+    'group_aggregate',
+    'group_quantiles',
+    'instrumentation',
+    'ios_rules',
+    'is_english',
+    'is_english_batch',
+    'keep_english',
+    'keep_free',
+    'load_many',
+    'load_table',
+    'match_apps',
+    'normalize_name',
+    'parse_column',
+    'parse_installs',
+    'parse_price',
+    'popularity',
+    'price_equals',
+    'profile_parallel',
+    'read_concurrently',
+    'result_cache',
+    'save_table',
+    'scan_csv',
+    'split_header',
+    'stream_rows',
+    'summarize',
+    'validate_rows',
+]
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
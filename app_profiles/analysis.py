@@ -0,0 +1,101 @@
+"""The analysis of the notebook as functions that return their results.
+
+``analyze_android`` and ``analyze_ios`` compute the frequency tables,
+per-genre averages (plain and without outliers) and drill-downs the
+notebook prints, as plain dicts and lists that ``app_profiles.report``
+renders as text, JSON, Markdown or csv.
+"""
+
+import heapq
+from operator import itemgetter
+
+from app_profiles.cache import cached_table
+from app_profiles.frequency import freq_table
+from app_profiles.groupby import group_aggregate
+from app_profiles.index import AppIndex
+from app_profiles.load import clean_android, clean_ios
+from app_profiles.robust import popularity
+from app_profiles.table import ANDROID_SCHEMA, IOS_SCHEMA, AppTable
+
+
+def load_android(path, max_non_ascii=3, cache_dir=None):
+    """Return the free, English, de-duplicated Google Play apps as an
+    ``AppTable``, through the on-disk cache when ``cache_dir`` is given."""
+    if cache_dir is not None:
+        return cached_table(path, 'android', max_non_ascii, cache_dir)
+    header, rows = clean_android(path, max_non_ascii)
+    return AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+
+
+def load_ios(path, max_non_ascii=3, cache_dir=None):
+    """Return the free, English App Store apps as an ``AppTable``."""
+    if cache_dir is not None:
+        return cached_table(path, 'ios', max_non_ascii, cache_dir)
+    header, rows = clean_ios(path, max_non_ascii)
+    return AppTable.from_rows(header, rows, IOS_SCHEMA)
+
+
+def ranked(table, top=None):
+    """Return ``{key: value}`` ordered from the largest value down, keeping
+    only the ``top`` largest when given."""
+    pairs = ((value, key) for key, value in table.items())
+    if top is None:
+        pairs = sorted(pairs, reverse=True)
+    else:
+        pairs = heapq.nlargest(top, pairs)
+    return {key: value for value, key in pairs}
+
+
+def _means(groups, statistic='mean'):
+    return {key: group[statistic] for key, group in groups.items()}
+
+
+def drill_down(table, column, value, name_column, value_column, top=None,
+               index=None):
+    """Return ``[(app name, value), ...]`` for the apps whose ``column``
+    is ``value``, largest first, like the notebook's per-category loops.
+    Apps that share a name each get a row. Pass an ``AppIndex`` on
+    ``column`` to reuse it across drill-downs."""
+    index = index or AppIndex(table, [column])
+    names = table.column(name_column)
+    values = table.column(value_column)
+    rows = [(names[row_id], values[row_id])
+            for row_id in index.select({column: value})]
+    if top is None:
+        return sorted(rows, key=itemgetter(1), reverse=True)
+    return heapq.nlargest(top, rows, key=itemgetter(1))
+
+
+def analyze_android(table, top=None, drill_downs=()):
+    results = {
+        'apps': len(table),
+        'category': ranked(freq_table(table, 'Category'), top),
+        'genres': ranked(freq_table(table, 'Genres'), top),
+        'installs': ranked(freq_table(table, 'Installs'), top),
+        'avg_installs_by_category': ranked(_means(group_aggregate(
+            table, 'Category', 'n_installs', aggs=('mean',))), top),
+        'robust_installs_by_category': ranked(_means(popularity(
+            table, 'Category', 'n_installs'), 'robust_mean'), top),
+    }
+    index = AppIndex(table, ['Category']) if drill_downs else None
+    for category in drill_downs:
+        results['installs_in_' + category] = drill_down(
+            table, 'Category', category, 'App', 'n_installs', top, index)
+    return results
+
+
+def analyze_ios(table, top=None, drill_downs=()):
+    results = {
+        'apps': len(table),
+        'prime_genre': ranked(freq_table(table, 'prime_genre'), top),
+        'avg_ratings_by_genre': ranked(_means(group_aggregate(
+            table, 'prime_genre', 'rating_count_tot', aggs=('mean',))), top),
+        'robust_ratings_by_genre': ranked(_means(popularity(
+            table, 'prime_genre', 'rating_count_tot'), 'robust_mean'), top),
+    }
+    index = AppIndex(table, ['prime_genre']) if drill_downs else None
+    for genre in drill_downs:
+        results['ratings_in_' + genre] = drill_down(
+            table, 'prime_genre', genre, 'track_name', 'rating_count_tot',
+            top, index)
+    return results
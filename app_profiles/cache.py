@@ -0,0 +1,198 @@
+"""On-disk cache of cleaned, typed data sets.
+
+An entry is a directory holding ``meta.json`` and one binary file per
+column: raw ``array`` bytes for numeric columns, int32 codes for
+categorical columns (their distinct values live in ``meta.json``) and, for
+text columns, the UTF-8 bytes of every value plus an int64 offsets file.
+Loading memory-maps those files, so a warm run does no parsing at all.
+
+Entries are keyed by the SHA-256 of the source csv and the cleaning
+parameters. To avoid hashing the csv on every run, ``index.json``
+remembers the size and modification time the key was computed for, and
+the ``CACHE_VERSION`` it was computed with; when the source or the
+version changes, the old entry for it is evicted.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+from array import array
+
+from app_profiles.load import ANDROID, IOS, clean_android, clean_ios
+from app_profiles.table import ANDROID_SCHEMA, IOS_SCHEMA, AppTable, Categorical
+
+CACHE_DIR = '.app_profiles_cache'
+CACHE_VERSION = 3
+
+STORES = {
+    'android': (clean_android, ANDROID, ANDROID_SCHEMA),
+    'ios': (clean_ios, IOS, IOS_SCHEMA),
+}
+
+
+class TextColumn:
+    """Read-only sequence of strings backed by a UTF-8 blob and offsets."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        start = self.offsets[position]
+        end = self.offsets[position + 1]
+        return bytes(self.blob[start:end]).decode('utf8')
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as opened_file:
+        for block in iter(lambda: opened_file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(content_digest, store, max_non_ascii, free_price):
+    params = json.dumps([CACHE_VERSION, store, max_non_ascii, free_price])
+    return hashlib.sha256(
+        (content_digest + params).encode('utf8')).hexdigest()
+
+
+def _write(path, data):
+    with open(path, 'wb') as opened_file:
+        opened_file.write(data)
+
+
+def _map(path, typecode):
+    if os.path.getsize(path) == 0:
+        return array(typecode)
+    with open(path, 'rb') as opened_file:
+        mapped = mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+def save_table(table, directory):
+    """Write ``table`` to ``directory`` in the cache's columnar format."""
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    for position, name in enumerate(table.columns):
+        column = table.columns[name]
+        base = os.path.join(directory, str(position))
+        if isinstance(column, Categorical):
+            _write(base + '.bin', array('i', column.codes).tobytes())
+            columns.append({'name': name, 'kind': 'categorical',
+                            'categories': column.categories})
+        elif isinstance(column, (array, memoryview)):
+            typecode = getattr(column, 'typecode', None) or column.format
+            _write(base + '.bin', array(typecode, column).tobytes())
+            columns.append({'name': name, 'kind': 'numeric',
+                            'typecode': typecode})
+        else:
+            encoded = [value.encode('utf8') for value in column]
+            offsets = array('q', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            _write(base + '.bin', b''.join(encoded))
+            _write(base + '.offsets', offsets.tobytes())
+            columns.append({'name': name, 'kind': 'text'})
+
+    meta = {'header': table.header, 'columns': columns,
+            'bad_values': [[column, row_id, value] for (column, row_id), value
+                           in table.bad_values.items()]}
+    with open(os.path.join(directory, 'meta.json'), 'w',
+              encoding='utf8') as opened_file:
+        json.dump(meta, opened_file)
+
+
+def load_table(directory):
+    """Memory-map a table written by ``save_table``."""
+    with open(os.path.join(directory, 'meta.json'),
+              encoding='utf8') as opened_file:
+        meta = json.load(opened_file)
+
+    columns = {}
+    for position, column in enumerate(meta['columns']):
+        base = os.path.join(directory, str(position))
+        if column['kind'] == 'categorical':
+            loaded = Categorical()
+            loaded.categories = column['categories']
+            loaded.lookup = {value: code for code, value
+                             in enumerate(loaded.categories)}
+            loaded.codes = _map(base + '.bin', 'i')
+        elif column['kind'] == 'numeric':
+            loaded = _map(base + '.bin', column['typecode'])
+        else:
+            with open(base + '.bin', 'rb') as opened_file:
+                blob = (mmap.mmap(opened_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+                        if os.path.getsize(base + '.bin') else b'')
+            loaded = TextColumn(blob, _map(base + '.offsets', 'q'))
+        columns[column['name']] = loaded
+    bad_values = {(column, row_id): value
+                  for column, row_id, value in meta['bad_values']}
+    return AppTable(meta['header'], columns, bad_values)
+
+
+def _read_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'index.json'),
+                  encoding='utf8') as opened_file:
+            return json.load(opened_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(cache_dir, index):
+    path = os.path.join(cache_dir, 'index.json')
+    with open(path + '.tmp', 'w', encoding='utf8') as opened_file:
+        json.dump(index, opened_file)
+    os.replace(path + '.tmp', path)
+
+
+def cached_table(path, store, max_non_ascii=3, cache_dir=CACHE_DIR):
+    """Return the cleaned ``AppTable`` for a store csv, from the cache when
+    the file and the cleaning parameters are unchanged."""
+    clean, spec, schema = STORES[store]
+    os.makedirs(cache_dir, exist_ok=True)
+    index = _read_index(cache_dir)
+    source = json.dumps([os.path.abspath(path), store, max_non_ascii,
+                         spec['free_price']])
+    stat = os.stat(path)
+    fingerprint = [stat.st_size, stat.st_mtime_ns]
+
+    entry = index.get(source)
+    if (entry is not None and entry['fingerprint'] == fingerprint
+            and entry.get('version') == CACHE_VERSION):
+        key = entry['key']
+    else:
+        key = cache_key(file_digest(path), store, max_non_ascii,
+                        spec['free_price'])
+
+    directory = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(directory, 'meta.json')):
+        table = load_table(directory)
+    else:
+        header, rows = clean(path, max_non_ascii)
+        save_table(AppTable.from_rows(header, rows, schema), directory)
+        table = load_table(directory)
+
+    if entry is not None and entry['key'] != key:
+        still_used = any(other['key'] == entry['key']
+                         for name, other in index.items() if name != source)
+        if not still_used:
+            shutil.rmtree(os.path.join(cache_dir, entry['key']),
+                          ignore_errors=True)
+    index[source] = {'fingerprint': fingerprint, 'version': CACHE_VERSION,
+                     'key': key}
+    _write_index(cache_dir, index)
+    return table
@@ -0,0 +1,84 @@
+"""Command line interface: ``app-profiles analyze``."""
+
+import argparse
+import sys
+
+
+def analyze(args, out):
+    from app_profiles.analysis import (
+        analyze_android,
+        analyze_ios,
+        load_android,
+        load_ios,
+    )
+    from app_profiles.report import Report
+
+    results = {}
+    if args.android:
+        table = load_android(args.android, args.max_non_ascii, args.cache_dir)
+        results['android'] = analyze_android(
+            table, args.top, args.android_drill_down)
+    if args.ios:
+        table = load_ios(args.ios, args.max_non_ascii, args.cache_dir)
+        results['ios'] = analyze_ios(table, args.top, args.ios_drill_down)
+
+    Report.from_results(results).write(args.output or out, args.format)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='app-profiles',
+        description='Find profitable app profiles in Google Play and App '
+                    'Store data.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    analyze_parser = commands.add_parser(
+        'analyze', help='frequency tables and per-genre averages of the '
+                        'free English apps')
+    analyze_parser.add_argument('--android', metavar='CSV',
+                                help='googleplaystore.csv')
+    analyze_parser.add_argument('--ios', metavar='CSV',
+                                help='AppleStore.csv')
+    analyze_parser.add_argument('--format',
+                                choices=('text', 'json', 'markdown', 'csv'),
+                                default='text')
+    analyze_parser.add_argument('--output', metavar='PATH', default=None,
+                                help='write to this file instead of stdout; '
+                                     'a directory with one file per table '
+                                     'for --format csv')
+    analyze_parser.add_argument('--android-drill-down', metavar='CATEGORY',
+                                action='append', default=[],
+                                help='list the installs of every app in '
+                                     'this category (repeatable)')
+    analyze_parser.add_argument('--ios-drill-down', metavar='GENRE',
+                                action='append', default=[],
+                                help='list the rating counts of every app '
+                                     'in this genre (repeatable)')
+    analyze_parser.add_argument('--top', type=int, default=None,
+                                help='only show the N largest values of '
+                                     'every table')
+    analyze_parser.add_argument('--max-non-ascii', type=int, default=3,
+                                help='non-ASCII characters allowed in an '
+                                     'English app name (default: 3)')
+    analyze_parser.add_argument('--cache-dir', default=None,
+                                help='cache the cleaned data sets in this '
+                                     'directory')
+    return parser
+
+
+def main(argv=None, out=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    out = out or sys.stdout
+    if args.command == 'analyze':
+        if not (args.android or args.ios):
+            parser.error('analyze needs --android and/or --ios')
+        if args.format == 'csv' and not args.output:
+            parser.error('--format csv needs --output DIRECTORY')
+        analyze(args, out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
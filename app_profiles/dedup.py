@@ -0,0 +1,43 @@
+"""Hash-based removal of duplicate app entries."""
+
+from app_profiles.instrument import instrumented
+
+
+def _column_getter(keep_by):
+    if keep_by is None or callable(keep_by):
+        return keep_by
+    return lambda row: float(row[keep_by])
+
+
+@instrumented('dedup')
+def deduplicate(rows, key_col, keep_by=None):
+    """Keep one row per value of ``row[key_col]`` in a single pass.
+
+    ``keep_by`` is either a column index (compared as a float, like the
+    ``reviews_max`` rule) or a callable returning a sortable value for a
+    row. For every key the first row holding the largest value is kept;
+    with no ``keep_by`` the first occurrence wins. Returns
+    ``(unique_rows, duplicate_names)`` where ``unique_rows`` are in the
+    same order the original ``reviews_max`` / ``already_added`` loops
+    produced them and ``duplicate_names`` lists every repeated key in the
+    order it was seen.
+    """
+    value_of = _column_getter(keep_by)
+    best = {}
+    duplicate_names = []
+
+    for position, row in enumerate(rows):
+        name = row[key_col]
+        value = value_of(row) if value_of is not None else None
+        kept = best.get(name)
+        if kept is None:
+            best[name] = [value, position, row]
+            continue
+        duplicate_names.append(name)
+        if value_of is not None and kept[0] < value:
+            kept[0] = value
+            kept[1] = position
+            kept[2] = row
+
+    kept_rows = sorted(best.values(), key=lambda entry: entry[1])
+    return [entry[2] for entry in kept_rows], duplicate_names
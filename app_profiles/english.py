@@ -0,0 +1,27 @@
+"""Detecting app names that are most likely English.
+
+A name counts as English when it has at most ``max_non_ascii`` characters
+outside the ASCII range, so a few emojis or symbols such as ™ or an em
+dash are tolerated. Rather than calling ``ord()`` on every character, the
+checks below let C do the work: ``str.isascii()`` settles the common case
+in one call, and otherwise encoding to ASCII with ``errors='ignore'``
+drops exactly the non-ASCII characters, so the length difference is their
+count.
+"""
+
+
+def non_ascii_count(string):
+    if string.isascii():
+        return 0
+    return len(string) - len(string.encode('ascii', 'ignore'))
+
+
+def is_english(string, max_non_ascii=3):
+    return non_ascii_count(string) <= max_non_ascii
+
+
+def is_english_batch(names, max_non_ascii=3):
+    """Classify a whole column of names, returning a list of booleans."""
+    return [name.isascii()
+            or len(name) - len(name.encode('ascii', 'ignore')) <= max_non_ascii
+            for name in names]
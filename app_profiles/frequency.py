@@ -0,0 +1,68 @@
+"""Frequency tables for a column of a data set."""
+
+import heapq
+from collections import Counter
+
+from app_profiles.instrument import instrumented
+from app_profiles.memo import memoized
+from app_profiles.sketch import ApproximateCounter
+from app_profiles.table import AppTable
+
+
+@memoized('freq_table', columns=('index',))
+@instrumented('freq_table')
+def freq_table(dataset, index, approximate=False, **sketch_options):
+    """Return ``{value: percentage}`` for column ``index`` of ``dataset``.
+
+    ``dataset`` is either a list of rows or an ``AppTable``; for a table
+    the counting runs over the stored column (integer codes for
+    categorical columns) instead of over rows of strings.
+
+    With ``approximate=True`` the counts come from an
+    ``ApproximateCounter`` in fixed memory, for columns with too many
+    distinct values to count exactly (app names, Genres combinations on
+    huge inputs). ``sketch_options`` (``epsilon``, ``delta``,
+    ``precision``, ``max_keys``) are passed on to it; only the
+    ``max_keys`` most frequent values appear in the table.
+
+    Results are memoized per data set version (see ``app_profiles.memo``).
+    """
+    if approximate:
+        if isinstance(dataset, AppTable):
+            unparsed = dataset.unparsed(index)
+            values = dataset.column(index)
+            if unparsed:
+                values = (unparsed.get(row_id, value)
+                          for row_id, value in enumerate(values))
+        else:
+            values = (row[index] for row in dataset)
+        return ApproximateCounter(**sketch_options).update(values).table()
+
+    if isinstance(dataset, AppTable):
+        table = dataset.counts(index)
+    else:
+        table = Counter(row[index] for row in dataset)
+    total = sum(table.values())
+
+    table_percentages = {}
+    for key in table:
+        table_percentages[key] = (table[key] / total) * 100
+
+    return table_percentages
+
+
+def display_table(dataset, index, top=None, approximate=False,
+                  **sketch_options):
+    """Print the frequency table of a column in descending order; with
+    ``top`` only the ``top`` most frequent values are ranked, using a heap
+    of that size instead of sorting every value. ``approximate`` and
+    ``sketch_options`` are passed on to ``freq_table``."""
+    table = freq_table(dataset, index, approximate, **sketch_options)
+    table_display = ((table[key], key) for key in table)
+
+    if top is None:
+        table_sorted = sorted(table_display, reverse=True)
+    else:
+        table_sorted = heapq.nlargest(top, table_display)
+    for entry in table_sorted:
+        print(entry[1], ':', entry[0])
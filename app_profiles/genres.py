@@ -0,0 +1,163 @@
+"""Single genres of the multi-valued Google Play ``Genres`` column.
+
+A value such as 'Art & Design;Pretend Play' lists several genres, so a
+frequency table of the raw strings splits the apps of one genre over
+many combinations. ``GenreIndex`` splits every distinct combination once
+into a list of integer genre ids. Per-app data stays a single combination
+code per row (the codes of a ``Categorical`` column are reused as they
+are). Counts, co-occurrences and per-genre aggregates are first computed
+per combination and only then spread over its genres, so a query costs
+one pass over the codes plus the number of distinct combinations.
+"""
+
+from array import array
+from collections import Counter
+
+from app_profiles.parse import memoize, parse_installs
+from app_profiles.table import AppTable, Categorical
+
+
+class GenreIndex:
+    """Genre ids for every combination in column ``column`` of a data set.
+
+    ``genres`` lists the single genres in first-seen order and
+    ``combination_genres(code)`` the genre ids of a combination, stored
+    flat in ``genre_ids`` with ``offsets`` marking where each one starts.
+    Build the index after cleaning; it does not follow later changes to
+    the data set.
+
+    On a list of rows ``column`` is a position, or a name looked up in
+    ``header``.
+    """
+
+    def __init__(self, dataset, column='Genres', separator=';', header=None):
+        self.dataset = dataset
+        self.header = header
+        if isinstance(dataset, AppTable):
+            stored = dataset.column(column)
+            if not isinstance(stored, Categorical):
+                stored = Categorical(stored)
+        else:
+            column = self._position(column)
+            stored = Categorical(row[column] for row in dataset)
+        self.combinations = stored.categories
+        self.codes = stored.codes
+
+        self.genres = []
+        self.lookup = {}
+        self.offsets = array('i', [0])
+        self.genre_ids = array('i')
+        for combination in self.combinations:
+            for genre in combination.split(separator):
+                genre_id = self.lookup.get(genre)
+                if genre_id is None:
+                    genre_id = self.lookup[genre] = len(self.genres)
+                    self.genres.append(genre)
+                self.genre_ids.append(genre_id)
+            self.offsets.append(len(self.genre_ids))
+
+    def _position(self, column):
+        if isinstance(column, int):
+            return column
+        if self.header is None:
+            raise TypeError('Column {!r} of a list of rows needs a header; '
+                            'pass header= or a column index'.format(column))
+        return list(self.header).index(column)
+
+    def combination_genres(self, code):
+        return self.genre_ids[self.offsets[code]:self.offsets[code + 1]]
+
+    def _combination_counts(self):
+        return Counter(self.codes)
+
+    def counts(self):
+        """Return ``{genre: number of apps listing it}``."""
+        counts = [0] * len(self.genres)
+        for code, n in self._combination_counts().items():
+            for genre_id in self.combination_genres(code):
+                counts[genre_id] += n
+        return dict(zip(self.genres, counts))
+
+    def freq_table(self):
+        """Return ``{genre: percentage of apps listing it}``; an app with
+        several genres counts for each, so the total exceeds 100."""
+        total = len(self.codes)
+        return {genre: n / total * 100 for genre, n in self.counts().items()}
+
+    def cooccurrence(self):
+        """Return a ``len(genres)`` square matrix (a list of lists) where
+        ``[i][j]`` is the number of apps listing both genre ``i`` and genre
+        ``j``; the diagonal holds ``counts()``."""
+        size = len(self.genres)
+        matrix = [[0] * size for _ in range(size)]
+        for code, n in self._combination_counts().items():
+            genre_ids = self.combination_genres(code)
+            for first in genre_ids:
+                row = matrix[first]
+                for second in genre_ids:
+                    row[second] += n
+        return matrix
+
+    def pairs(self):
+        """Return ``{(genre, genre): number of apps}`` for the pairs of
+        different genres that occur together, most frequent first."""
+        matrix = self.cooccurrence()
+        genres = self.genres
+        pairs = {}
+        for first in range(len(genres)):
+            row = matrix[first]
+            for second in range(first + 1, len(genres)):
+                if row[second]:
+                    pairs[genres[first], genres[second]] = row[second]
+        return dict(sorted(pairs.items(), key=lambda item: -item[1]))
+
+    def aggregate(self, value_fn):
+        """Return ``{genre: {'count', 'sum', 'mean'}}`` of a number per app.
+
+        ``value_fn`` is a callable taking a row, like ``group_aggregate``'s,
+        or a column: a numeric column of an ``AppTable``, or a column of the
+        rows whose values are parsed like install counts ('50,000+' ->
+        50000.0). None, NaN and values that don't parse are skipped.
+        """
+        if callable(value_fn):
+            values = [value_fn(row) for row in self.dataset]
+        elif isinstance(self.dataset, AppTable):
+            values = self.dataset.numbers(value_fn)
+        else:
+            column = self._position(value_fn)
+            parse = memoize(parse_installs)
+            values = []
+            for row in self.dataset:
+                try:
+                    values.append(parse(row[column]))
+                except ValueError:
+                    values.append(None)
+
+        sizes = [0] * len(self.combinations)
+        totals = [0.0] * len(self.combinations)
+        for code, value in zip(self.codes, values):
+            if value is not None and value == value:
+                sizes[code] += 1
+                totals[code] += value
+
+        genre_sizes = [0] * len(self.genres)
+        genre_totals = [0.0] * len(self.genres)
+        for code in range(len(self.combinations)):
+            if sizes[code]:
+                for genre_id in self.combination_genres(code):
+                    genre_sizes[genre_id] += sizes[code]
+                    genre_totals[genre_id] += totals[code]
+        return {genre: {'count': size, 'sum': total,
+                        'mean': total / size if size else float('nan')}
+                for genre, size, total in zip(self.genres, genre_sizes,
+                                              genre_totals)}
+
+    def ids(self, genre):
+        """Return the sorted row ids of the apps listing ``genre``."""
+        genre_id = self.lookup.get(genre)
+        if genre_id is None:
+            return []
+        wanted = {code for code in range(len(self.combinations))
+                  if genre_id in self.combination_genres(code)}
+        return [row_id for row_id, code in enumerate(self.codes)
+                if code in wanted]
@@ -0,0 +1,84 @@
+"""One-pass group-by aggregation."""
+
+from statistics import median
+
+from app_profiles.instrument import instrumented
+from app_profiles.memo import memoized
+from app_profiles.table import AppTable, Categorical
+
+AGGREGATES = ('count', 'sum', 'mean', 'median')
+
+
+def _pairs(dataset, key_index, value_fn):
+    """Yield ``(key, value)`` for every row, reading straight from the
+    stored columns when ``dataset`` is an ``AppTable`` and ``value_fn``
+    names a column."""
+    if isinstance(dataset, AppTable) and not callable(value_fn):
+        keys = dataset.column(key_index)
+        values = dataset.numbers(value_fn)
+        if isinstance(keys, Categorical):
+            categories = keys.categories
+            for code, value in zip(keys.codes, values):
+                yield categories[code], value
+        else:
+            yield from zip(keys, values)
+        return
+
+    if not callable(value_fn):
+        column = value_fn
+        value_fn = lambda row: float(row[column])
+    for row in dataset:
+        yield row[key_index], value_fn(row)
+
+
+@memoized('group_aggregate', columns=('key_index', 'value_fn'),
+          copy=lambda groups: {key: dict(result)
+                               for key, result in groups.items()})
+@instrumented('group_aggregate')
+def group_aggregate(dataset, key_index, value_fn,
+                    aggs=('count', 'sum', 'mean', 'median')):
+    """Aggregate a value per group of column ``key_index`` in one pass.
+
+    ``value_fn`` is a callable taking a row, or a column index/name whose
+    values are used as numbers. Rows for which ``value_fn`` returns None or
+    NaN (a value that didn't parse) are left out, which lets a single pass
+    also compute conditional figures such as the average of apps under 100
+    million installs. Returns ``{key: {aggregate: result}}`` with the groups
+    in the order they were first seen. Results are memoized like
+    ``freq_table``'s, so pass the same ``value_fn`` object to reuse them.
+    """
+    for agg in aggs:
+        if agg not in AGGREGATES:
+            raise ValueError('Unknown aggregate: {!r}'.format(agg))
+    keep_values = 'median' in aggs
+
+    totals = {}
+    sizes = {}
+    values_by_key = {}
+    for key, value in _pairs(dataset, key_index, value_fn):
+        if value is None or value != value:
+            continue
+        if key in sizes:
+            totals[key] += value
+            sizes[key] += 1
+        else:
+            totals[key] = value
+            sizes[key] = 1
+            values_by_key[key] = []
+        if keep_values:
+            values_by_key[key].append(value)
+
+    groups = {}
+    for key in sizes:
+        result = {}
+        for agg in aggs:
+            if agg == 'count':
+                result[agg] = sizes[key]
+            elif agg == 'sum':
+                result[agg] = totals[key]
+            elif agg == 'mean':
+                result[agg] = totals[key] / sizes[key]
+            else:
+                result[agg] = median(values_by_key[key])
+        groups[key] = result
+    return groups
@@ -0,0 +1,140 @@
+"""Incremental profiling of daily store snapshots.
+
+``IncrementalProfile`` keeps everything the full-file analysis derives
+from the rows — the entry with the most reviews per app, the frequency
+counts of the free apps and the sums and counts behind the per-genre
+averages — and updates it row by row. Google Play apps are keyed on the
+name and App Store apps on their id, as in ``load_many``. Applying a delta
+therefore costs time proportional to the delta. When a new entry replaces
+the kept entry of an app, the old entry's contributions are subtracted
+first.
+"""
+
+import pickle
+
+from app_profiles.english import is_english
+from app_profiles.load import ANDROID, IOS, split_header, stream_rows
+from app_profiles.parse import parse_installs, parse_price, price_equals
+from app_profiles.validate import android_rules, ios_rules, validate_rows
+
+STORES = {'android': ANDROID, 'ios': IOS}
+RULES = {'android': android_rules, 'ios': ios_rules}
+
+
+class IncrementalProfile:
+    """Running profile of one store.
+
+    ``columns`` are the column indexes to keep frequency counts for and
+    ``groups`` are ``(key_col, value_col)`` pairs to keep running averages
+    for; values are parsed like install counts ('1,000+' -> 1000.0) and
+    rows whose value doesn't parse are left out of the average.
+    Google Play rows are de-duplicated on the app name with the
+    ``reviews_max`` rule and App Store rows on their id, keeping the entry
+    with the most ratings, so a delta that re-sends an app replaces it.
+    """
+
+    def __init__(self, store, columns=(), groups=(), max_non_ascii=3):
+        self.store = store
+        self.spec = STORES[store]
+        self.columns = tuple(columns)
+        self.groups = tuple(groups)
+        self.max_non_ascii = max_non_ascii
+        self.free_price = parse_price(self.spec['free_price'])
+        self.header = None
+        self.sequence = 0
+        self.best = {}
+        self.rows_by_sequence = {}
+        self.counts = {column: {} for column in self.columns}
+        self.totals = {group: {} for group in self.groups}
+
+    def _is_free(self, row):
+        return price_equals(row[self.spec['price']], self.free_price)
+
+    def _count(self, row, sign):
+        for column in self.columns:
+            table = self.counts[column]
+            value = row[column]
+            table[value] = table.get(value, 0) + sign
+            if not table[value]:
+                del table[value]
+        for group in self.groups:
+            key_col, value_col = group
+            try:
+                value = parse_installs(row[value_col])
+            except ValueError:
+                continue
+            totals = self.totals[group]
+            key = row[key_col]
+            total = totals.setdefault(key, [0.0, 0])
+            total[0] += sign * value
+            total[1] += sign
+            if not total[1]:
+                del totals[key]
+
+    def _add(self, row):
+        self.rows_by_sequence[self.sequence] = row
+        if self._is_free(row):
+            self._count(row, 1)
+
+    def _remove(self, sequence):
+        row = self.rows_by_sequence.pop(sequence)
+        if self._is_free(row):
+            self._count(row, -1)
+
+    def apply_rows(self, rows):
+        """Fold an iterable of data rows (no header) into the profile."""
+        name_col = self.spec['name']
+        if self.store == 'android':
+            key_col, keep_col = name_col, self.spec['reviews']
+        else:
+            key_col, keep_col = self.spec['id'], self.spec['rating_count']
+        for row in rows:
+            if not is_english(row[name_col], self.max_non_ascii):
+                continue
+            self.sequence += 1
+            key = row[key_col]
+            value = float(row[keep_col])
+            kept = self.best.get(key)
+            if kept is None:
+                self.best[key] = (value, self.sequence)
+                self._add(row)
+            elif kept[0] < value:
+                self._remove(kept[1])
+                self.best[key] = (value, self.sequence)
+                self._add(row)
+
+    def apply_csv(self, path, bad_rows=None):
+        """Fold a full or delta csv file with a header into the profile.
+
+        Rows are validated like ``clean_android``'s / ``clean_ios``'s;
+        rejected rows are appended to ``bad_rows`` when a list is given.
+        """
+        header, rows = split_header(stream_rows(path))
+        if self.header is None:
+            self.header = header
+        self.apply_rows(validate_rows(rows, header, RULES[self.store](),
+                                      bad_rows))
+
+    def rows(self):
+        """Return the free apps in the order the full-file pipeline gives."""
+        return [self.rows_by_sequence[sequence]
+                for sequence in sorted(self.rows_by_sequence)
+                if self._is_free(self.rows_by_sequence[sequence])]
+
+    def freq_table(self, column):
+        table = self.counts[column]
+        total = sum(table.values())
+        return {key: (table[key] / total) * 100 for key in table}
+
+    def group_means(self, key_col, value_col):
+        totals = self.totals[(key_col, value_col)]
+        return {key: total / count for key, (total, count) in totals.items()}
+
+    def save(self, path):
+        with open(path, 'wb') as opened_file:
+            pickle.dump(self, opened_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as opened_file:
+            return pickle.load(opened_file)
@@ -0,0 +1,75 @@
+"""Secondary indexes for drill-down queries on a cleaned data set."""
+
+from app_profiles.table import AppTable, Categorical
+
+
+class AppIndex:
+    """Maps every value of the indexed columns to the set of row ids that
+    hold it, so a query such as "COMMUNICATION apps with 100,000,000+
+    installs or more" is a set intersection instead of a full scan.
+
+    ``columns`` are column positions for a list of rows, or names or
+    positions for an ``AppTable``. Build the index after cleaning; it does
+    not follow later changes to the data set.
+    """
+
+    def __init__(self, dataset, columns):
+        self.dataset = dataset
+        self.indexes = {}
+        for column in columns:
+            self.indexes[self._key(column)] = self._build(column)
+
+    def _key(self, column):
+        if isinstance(self.dataset, AppTable):
+            return self.dataset.name_of(column)
+        return column
+
+    def _build(self, column):
+        index = {}
+        if isinstance(self.dataset, AppTable):
+            stored = self.dataset.column(column)
+            if isinstance(stored, Categorical):
+                by_code = [set() for _ in stored.categories]
+                for row_id, code in enumerate(stored.codes):
+                    by_code[code].add(row_id)
+                return dict(zip(stored.categories, by_code))
+            values = stored
+            # values that didn't parse are found by their original string
+            unparsed = self.dataset.unparsed(column)
+            if unparsed:
+                values = [unparsed.get(row_id, value)
+                          for row_id, value in enumerate(stored)]
+        else:
+            values = (row[column] for row in self.dataset)
+        for row_id, value in enumerate(values):
+            ids = index.get(value)
+            if ids is None:
+                index[value] = ids = set()
+            ids.add(row_id)
+        return index
+
+    def ids(self, column, values):
+        """Return the row ids where ``column`` equals ``values`` (a single
+        value, or any of a list, tuple or set of values)."""
+        index = self.indexes[self._key(column)]
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            return index.get(values, set())
+        if len(values) == 1:
+            return index.get(next(iter(values)), set())
+        matched = set()
+        for value in values:
+            matched.update(index.get(value, ()))
+        return matched
+
+    def select(self, criteria):
+        """Return the sorted row ids matching every ``{column: values}``
+        criterion."""
+        matches = sorted((self.ids(column, values)
+                          for column, values in criteria.items()), key=len)
+        if not matches:
+            return list(range(len(self.dataset)))
+        return sorted(matches[0].intersection(*matches[1:]))
+
+    def rows(self, criteria):
+        """Return the matching rows in data set order."""
+        return [self.dataset[row_id] for row_id in self.select(criteria)]
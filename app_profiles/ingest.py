@@ -0,0 +1,168 @@
+"""Concurrent ingestion of many regional store files.
+
+``read_concurrently`` reads a list of csv files that share a header on
+reader threads. They push batches of rows onto a bounded queue, so when
+the consumer falls behind they block instead of piling rows up in memory.
+Every row is tagged with ``(file_index, row_index)``; ``load_many`` uses
+those tags to merge the files into one de-duplicated stream whose content
+and order don't depend on which file happened to be read first.
+"""
+
+import atexit
+import queue
+import threading
+import weakref
+from collections import deque
+from csv import reader
+
+from app_profiles.english import is_english
+from app_profiles.load import ANDROID, IOS, keep_free
+from app_profiles.validate import android_rules, ios_rules, validate_tagged
+
+STORES = {'android': ANDROID, 'ios': IOS}
+RULES = {'android': android_rules, 'ios': ios_rules}
+
+_DONE = object()
+
+# Stop events of the reads in progress. Reader threads are daemons, so a
+# half-read ``rows`` that is never closed can't keep the interpreter
+# alive, and at exit they are told to stop instead of being frozen
+# mid-file.
+_STOPS = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_readers():
+    for stop in list(_STOPS):
+        stop.set()
+
+
+def _read_header(path, encoding):
+    with open(path, encoding=encoding, newline='') as opened_file:
+        return next(reader(opened_file))
+
+
+def _put(rows_queue, item, stop):
+    while not stop.is_set():
+        try:
+            rows_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _read_file(file_index, path, rows_queue, stop, batch_size, encoding):
+    try:
+        with open(path, encoding=encoding, newline='') as opened_file:
+            rows = reader(opened_file)
+            next(rows)
+            batch = []
+            for row_index, row in enumerate(rows):
+                batch.append(((file_index, row_index), row))
+                if len(batch) == batch_size:
+                    if not _put(rows_queue, batch, stop):
+                        return
+                    batch = []
+            if batch:
+                _put(rows_queue, batch, stop)
+    except Exception as error:
+        _put(rows_queue, error, stop)
+    finally:
+        _put(rows_queue, _DONE, stop)
+
+
+def _read_files(files, rows_queue, stop, batch_size, encoding):
+    while not stop.is_set():
+        try:
+            file_index, path = files.popleft()
+        except IndexError:
+            return
+        _read_file(file_index, path, rows_queue, stop, batch_size, encoding)
+
+
+def read_concurrently(paths, max_workers=4, queue_size=64, batch_size=1000,
+                      encoding='utf8'):
+    """Return ``(header, rows)`` where ``rows`` yields
+    ``((file_index, row_index), row)`` from all ``paths``.
+
+    At most ``max_workers`` files are read at once and at most
+    ``queue_size`` batches of ``batch_size`` rows wait in memory. Rows from
+    one file keep their order; rows of different files are interleaved.
+    Call ``rows.close()`` when stopping early to end the reads right away.
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError('No files to read')
+    headers = [_read_header(path, encoding) for path in paths]
+    for path, header in zip(paths, headers):
+        if header != headers[0]:
+            raise ValueError('{} has a different header: {}'.format(path,
+                                                                    header))
+
+    def rows():
+        rows_queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        _STOPS.add(stop)
+        files = deque(enumerate(paths))
+        threads = [threading.Thread(target=_read_files, daemon=True,
+                                    args=(files, rows_queue, stop,
+                                          batch_size, encoding))
+                   for _ in range(min(max_workers, len(paths)))]
+        try:
+            for thread in threads:
+                thread.start()
+            remaining = len(paths)
+            while remaining:
+                item = rows_queue.get()
+                if item is _DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            stop.set()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            _STOPS.discard(stop)
+
+    return headers[0], rows()
+
+
+def load_many(paths, store, max_non_ascii=3, max_workers=4, queue_size=64,
+              bad_rows=None):
+    """Read many files of one store concurrently and return ``(header,
+    rows)`` with the free, English apps, de-duplicated across all files.
+
+    Google Play apps are matched on the name and the entry with the most
+    reviews is kept; App Store apps are matched on their id and the entry
+    with the most ratings is kept. Ties go to the earlier file (in the
+    order of ``paths``) and row, and the rows come out in that order too.
+    Rows are validated like ``clean_android``'s / ``clean_ios``'s; rejected
+    rows are appended to ``bad_rows`` when a list is given.
+    """
+    spec = STORES[store]
+    if store == 'android':
+        key_col, keep_col = spec['name'], spec['reviews']
+    else:
+        key_col, keep_col = spec['id'], spec['rating_count']
+    name_col = spec['name']
+
+    header, tagged = read_concurrently(paths, max_workers, queue_size)
+    best = {}
+    for position, row in validate_tagged(tagged, header, RULES[store](),
+                                         bad_rows):
+        if not is_english(row[name_col], max_non_ascii):
+            continue
+        value = float(row[keep_col])
+        key = row[key_col]
+        kept = best.get(key)
+        if (kept is None or kept[0] < value
+                or (kept[0] == value and position < kept[1])):
+            best[key] = (value, position, row)
+
+    kept_rows = sorted(best.values(), key=lambda entry: entry[1])
+    return header, keep_free((entry[2] for entry in kept_rows),
+                             spec['price'], spec['free_price'])
@@ -0,0 +1,262 @@
+"""Opt-in per-stage instrumentation of the analysis pipeline.
+
+Pipeline functions are wrapped with ``instrumented(name)``. While the
+module-level ``instrumentation`` is disabled (the default) the wrapper
+only checks one attribute before calling through, and generator stages are
+handed back untouched. Once enabled, either with ``enable()`` or by
+setting the ``APP_PROFILES_INSTRUMENT`` environment variable, every stage
+records its call count, elapsed time excluding nested stages, rows in and
+out and, for eager stages, the memory it allocated and its peak traced
+memory above what was allocated when it started (via tracemalloc). Lazy
+stages (generators) are timed on each ``next()`` so a fused generator
+chain is still broken down per stage.
+"""
+
+import cProfile
+import functools
+import inspect
+import json
+import os
+import time
+import tracemalloc
+
+
+class StageRecord:
+    __slots__ = ('name', 'calls', 'seconds', 'rows_in', 'rows_out',
+                 'allocated_bytes', 'peak_bytes')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows_in = None
+        self.rows_out = None
+        self.allocated_bytes = None
+        self.peak_bytes = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _add(total, value):
+    if value is None:
+        return total
+    return value if total is None else total + value
+
+
+class _Frame:
+    """One timed entry into a stage; nested frames add their elapsed time
+    to ``child_seconds`` of the frame below them on the stack."""
+
+    __slots__ = ('record', 'start', 'child_seconds', 'memory', 'peak')
+
+    def __init__(self, record, memory):
+        self.record = record
+        self.child_seconds = 0.0
+        self.memory = memory
+        self.peak = 0
+        self.start = time.perf_counter()
+
+
+class Stage:
+    """Context manager returned by ``Instrumentation.stage``; set
+    ``rows_out`` before leaving the block to have it recorded."""
+
+    def __init__(self, instrumentation, name, rows_in=None):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        self.frame = self.instrumentation._enter(self.name, memory=True)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation._exit(self.frame)
+        record = self.frame.record
+        record.rows_in = _add(record.rows_in, self.rows_in)
+        record.rows_out = _add(record.rows_out, self.rows_out)
+        return False
+
+
+class _NullStage:
+    rows_in = None
+    rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    def __init__(self, enabled=False, trace_memory=True, profile=False):
+        self.enabled = False
+        self.trace_memory = False
+        self.profiler = None
+        self._started_tracing = False
+        self.reset()
+        if enabled:
+            self.enable(trace_memory, profile)
+
+    def reset(self):
+        self.records = {}
+        self._stack = []
+
+    def enable(self, trace_memory=True, profile=False):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if profile and self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def disable(self):
+        self.enabled = False
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, name):
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = StageRecord(name)
+        return record
+
+    def _enter(self, name, memory=False):
+        record = self._record(name)
+        memory = memory and self.trace_memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            memory = current
+        else:
+            memory = None
+        frame = _Frame(record, memory)
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame, count_call=True):
+        elapsed = time.perf_counter() - frame.start
+        self._stack.pop()
+        record = frame.record
+        if count_call:
+            record.calls += 1
+        record.seconds += elapsed - frame.child_seconds
+        if self._stack:
+            self._stack[-1].child_seconds += elapsed
+        if frame.memory is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame.peak)
+            record.allocated_bytes = _add(record.allocated_bytes,
+                                          current - frame.memory)
+            record.peak_bytes = max(record.peak_bytes or 0,
+                                    peak - frame.memory)
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, peak)
+
+    def stage(self, name, rows_in=None):
+        """Time a block of code as stage ``name``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return Stage(self, name, rows_in)
+
+    def watch(self, name, rows, rows_in=None):
+        """Yield from ``rows``, timing every ``next()`` as stage ``name``
+        and counting the rows that come out."""
+        record = self._record(name)
+        record.calls += 1
+        record.rows_in = _add(record.rows_in, rows_in)
+        record.rows_out = record.rows_out or 0
+        iterator = iter(rows)
+        while True:
+            frame = self._enter(name)
+            try:
+                row = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit(frame, count_call=False)
+            record.rows_out += 1
+            yield row
+
+    def report(self):
+        """Return the recorded stages as a list of dicts, in the order the
+        stages were first entered."""
+        return [record.as_dict() for record in self.records.values()]
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf8') as opened_file:
+            json.dump(self.report(), opened_file, indent=2)
+
+    def dump_stats(self, path):
+        """Write the cProfile data (readable with ``pstats``) to ``path``."""
+        if self.profiler is None:
+            raise RuntimeError('Profiling was not enabled')
+        self.profiler.create_stats()
+        self.profiler.dump_stats(path)
+
+
+instrumentation = Instrumentation(
+    enabled=bool(os.environ.get('APP_PROFILES_INSTRUMENT')))
+
+
+def _size(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def _rows_in(args, rows_arg):
+    if rows_arg is None or len(args) <= rows_arg:
+        return None
+    return _size(args[rows_arg])
+
+
+def instrumented(name, rows_arg=0):
+    """Record calls of the decorated pipeline function as stage ``name``.
+
+    ``rows_arg`` is the position of the argument holding the input rows,
+    used for the rows-in count when it has a length; None for stages that
+    don't take rows.
+    """
+    def decorate(function):
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                rows = function(*args, **kwargs)
+                if not instrumentation.enabled:
+                    return rows
+                return instrumentation.watch(name, rows,
+                                             _rows_in(args, rows_arg))
+            return wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            rows_in = _rows_in(args, rows_arg)
+            with instrumentation.stage(name, rows_in) as stage:
+                result = function(*args, **kwargs)
+                if isinstance(result, tuple) and result:
+                    stage.rows_out = _size(result[0])
+                else:
+                    stage.rows_out = _size(result)
+            return result
+        return wrapper
+    return decorate
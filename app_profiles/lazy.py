@@ -0,0 +1,212 @@
+"""Lazy data sets: compose filters and projections, run them in one pass.
+
+A ``LazyDataset`` only records the steps applied to it. When it is
+iterated, the plan is optimized and fused:
+
+* consecutive filters run in a single loop, cheapest first, so a price
+  check rejects a row before ``is_english`` looks at its name;
+* a filter that only reads the key column of a ``deduplicate`` step gives
+  the same result before or after it (every duplicate shares the key), so
+  it is pushed below the de-duplication, which then has less to remember;
+* no step builds an intermediate list, except ``deduplicate`` itself,
+  which has to see every row before it knows which one to keep.
+"""
+
+from app_profiles.dedup import deduplicate
+from app_profiles.english import is_english
+from app_profiles.load import (
+    ANDROID,
+    IOS,
+    drop_malformed,
+    split_header,
+    stream_rows,
+)
+from app_profiles.parse import parse_price, price_equals
+from app_profiles.validate import android_rules, ios_rules, validate_rows
+
+
+class Predicate:
+    """A row test with the columns it reads and a relative cost."""
+
+    def __init__(self, test, columns, cost=1, name=None):
+        self.test = test
+        self.columns = frozenset(columns)
+        self.cost = cost
+        self.name = name or getattr(test, '__name__', 'predicate')
+
+    def __repr__(self):
+        return '{}(cost={})'.format(self.name, self.cost)
+
+
+def english(name_col, max_non_ascii=3):
+    return Predicate(lambda row: is_english(row[name_col], max_non_ascii),
+                     [name_col], cost=10,
+                     name='english[{}]'.format(name_col))
+
+
+def free(price_col, free_price='0'):
+    price = parse_price(free_price)
+    return Predicate(lambda row: price_equals(row[price_col], price),
+                     [price_col], cost=1, name='free[{}]'.format(price_col))
+
+
+def equals(column, value):
+    return Predicate(lambda row: row[column] == value, [column], cost=1,
+                     name='{}=={!r}'.format(column, value))
+
+
+def is_in(column, values):
+    values = frozenset(values)
+    return Predicate(lambda row: row[column] in values, [column], cost=1,
+                     name='{} in {}'.format(column, sorted(values)))
+
+
+class _Filter:
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+
+class _Select:
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+
+
+class _Dedup:
+    def __init__(self, key_col, keep_by):
+        self.key_col = key_col
+        self.keep_by = keep_by
+
+
+def _optimize(steps):
+    """Return the steps grouped into stages: lists of filters (sorted by
+    cost) separated by projections and de-duplications, with filters on a
+    de-duplication key pushed below it."""
+    steps = list(steps)
+    changed = True
+    while changed:
+        changed = False
+        for position in range(1, len(steps)):
+            before, step = steps[position - 1], steps[position]
+            if (isinstance(before, _Dedup) and isinstance(step, _Filter)
+                    and step.predicate.columns <= {before.key_col}):
+                steps[position - 1], steps[position] = step, before
+                changed = True
+
+    stages = []
+    for step in steps:
+        if isinstance(step, _Filter):
+            if stages and isinstance(stages[-1], list):
+                stages[-1].append(step.predicate)
+            else:
+                stages.append([step.predicate])
+        else:
+            stages.append(step)
+    return [sorted(stage, key=lambda predicate: predicate.cost)
+            if isinstance(stage, list) else stage for stage in stages]
+
+
+def _run_filters(rows, predicates):
+    tests = [predicate.test for predicate in predicates]
+    if len(tests) == 1:
+        test = tests[0]
+        for row in rows:
+            if test(row):
+                yield row
+        return
+    for row in rows:
+        for test in tests:
+            if not test(row):
+                break
+        else:
+            yield row
+
+
+def _run_select(rows, columns):
+    for row in rows:
+        yield [row[column] for column in columns]
+
+
+class LazyDataset:
+    def __init__(self, source, header=None, steps=()):
+        self.source = source
+        self.header = header
+        self.steps = tuple(steps)
+
+    @classmethod
+    def from_csv(cls, path, bad_rows=None, rules=None, quarantine=None):
+        """Plan over a csv file; malformed rows, and rows failing
+        ``rules`` if given, are dropped while reading (see
+        ``validate_rows``)."""
+        header, _ = split_header(stream_rows(path))
+
+        def source():
+            _, rows = split_header(stream_rows(path))
+            if rules is None:
+                return drop_malformed(rows, len(header), bad_rows)
+            return validate_rows(rows, header, rules, bad_rows, quarantine)
+
+        return cls(source, header)
+
+    def _with(self, step, header=None):
+        return LazyDataset(self.source, header or self.header,
+                           self.steps + (step,))
+
+    def filter(self, predicate):
+        return self._with(_Filter(predicate))
+
+    def select(self, columns):
+        """Keep only ``columns``; later steps use positions in the
+        projected rows."""
+        header = ([self.header[column] for column in columns]
+                  if self.header else None)
+        return self._with(_Select(columns), header)
+
+    def deduplicate(self, key_col, keep_by=None):
+        return self._with(_Dedup(key_col, keep_by))
+
+    def plan(self):
+        return _optimize(self.steps)
+
+    def explain(self):
+        lines = []
+        for stage in self.plan():
+            if isinstance(stage, list):
+                lines.append('filter ' + ' -> '.join(map(repr, stage)))
+            elif isinstance(stage, _Select):
+                lines.append('select {}'.format(list(stage.columns)))
+            else:
+                lines.append('deduplicate key={} keep_by={}'.format(
+                    stage.key_col, stage.keep_by))
+        return '\n'.join(lines)
+
+    def __iter__(self):
+        source = self.source
+        rows = source() if callable(source) else iter(source)
+        for stage in self.plan():
+            if isinstance(stage, list):
+                rows = _run_filters(rows, stage)
+            elif isinstance(stage, _Select):
+                rows = _run_select(rows, stage.columns)
+            else:
+                rows = iter(deduplicate(rows, stage.key_col,
+                                        stage.keep_by)[0])
+        return rows
+
+    def collect(self):
+        return list(self)
+
+
+def clean_plan(path, store, max_non_ascii=3, bad_rows=None, quarantine=None):
+    """Return the notebook's cleaning chain for a store file as a plan."""
+    if store == 'android':
+        dataset = LazyDataset.from_csv(path, bad_rows, android_rules(),
+                                       quarantine)
+        dataset = dataset.deduplicate(ANDROID['name'], ANDROID['reviews'])
+        spec = ANDROID
+    else:
+        dataset = LazyDataset.from_csv(path, bad_rows, ios_rules(),
+                                       quarantine)
+        spec = IOS
+    return (dataset
+            .filter(english(spec['name'], max_non_ascii))
+            .filter(free(spec['price'], spec['free_price'])))
@@ -0,0 +1,93 @@
+"""Streaming ingestion of the Google Play and App Store CSV files.
+
+Every stage here is a generator, so rows flow from the file through the
+validation and the English / free filters one at a time. Only
+the duplicate removal has to remember something per app (the entry with
+the most reviews), so memory grows with the number of unique apps rather
+than with the size of the file.
+"""
+
+from csv import reader
+
+from app_profiles.dedup import deduplicate
+from app_profiles.english import is_english
+from app_profiles.instrument import instrumented
+from app_profiles.parse import parse_price, price_equals
+from app_profiles.validate import android_rules, ios_rules, validate_rows
+
+ANDROID = {'name': 0, 'reviews': 3, 'price': 7, 'free_price': '0'}
+IOS = {'id': 0, 'name': 1, 'price': 4, 'free_price': '0.0', 'rating_count': 5}
+
+
+@instrumented('load', rows_arg=None)
+def stream_rows(path, encoding='utf8'):
+    """Yield the rows of a CSV file, closing it once exhausted."""
+    with open(path, encoding=encoding, newline='') as opened_file:
+        for row in reader(opened_file):
+            yield row
+
+
+def split_header(rows):
+    """Return ``(header, remaining_rows)`` for an iterable of rows."""
+    rows = iter(rows)
+    return next(rows), rows
+
+
+@instrumented('malformed rows')
+def drop_malformed(rows, n_columns, bad_rows=None):
+    """Skip rows that don't have ``n_columns`` fields, like android[10472].
+
+    Skipped rows are appended to ``bad_rows`` when a list is given.
+    """
+    for row in rows:
+        if len(row) == n_columns:
+            yield row
+        elif bad_rows is not None:
+            bad_rows.append(row)
+
+
+@instrumented('language filter')
+def keep_english(rows, name_col, max_non_ascii=3):
+    for row in rows:
+        if is_english(row[name_col], max_non_ascii):
+            yield row
+
+
+@instrumented('price filter')
+def keep_free(rows, price_col, free_price='0'):
+    """Keep rows whose price parses to ``free_price`` ('0' and '0.0' are
+    the same price; '$0.99' is not)."""
+    if isinstance(free_price, str):
+        free_price = parse_price(free_price)
+    for row in rows:
+        if price_equals(row[price_col], free_price):
+            yield row
+
+
+def clean_android(path, max_non_ascii=3, bad_rows=None, quarantine=None):
+    """Return ``(header, rows)`` with the free, English, de-duplicated
+    Google Play apps.
+
+    Rows are validated first (see ``app_profiles.validate``); rejected
+    rows go to ``bad_rows`` and ``quarantine`` if they are given.
+
+    The English check only looks at the app name, which every duplicate
+    shares, so it runs before the de-duplication to keep its state small.
+    The price check has to wait until the most reviewed entry is known.
+    """
+    header, rows = split_header(stream_rows(path))
+    rows = validate_rows(rows, header, android_rules(), bad_rows, quarantine)
+    rows = keep_english(rows, ANDROID['name'], max_non_ascii)
+    unique_rows, _ = deduplicate(rows, ANDROID['name'],
+                                 keep_by=ANDROID['reviews'])
+    return header, keep_free(unique_rows, ANDROID['price'],
+                             ANDROID['free_price'])
+
+
+def clean_ios(path, max_non_ascii=3, bad_rows=None, quarantine=None):
+    """Return ``(header, rows)`` with the free, English App Store apps,
+    validated like ``clean_android``'s."""
+    header, rows = split_header(stream_rows(path))
+    rows = validate_rows(rows, header, ios_rules(), bad_rows, quarantine)
+    rows = keep_english(rows, IOS['name'], max_non_ascii)
+    return header, keep_free(rows, IOS['price'], IOS['free_price'])
@@ -0,0 +1,117 @@
+"""Matching apps across the Google Play and App Store catalogs.
+
+Names are normalized first: lower case, symbols such as ™ or ® and
+emojis removed, punctuation turned into spaces. iOS names then go into an
+inverted index from token to row ids. Each Android app only compares
+against the iOS apps that share one of its rarest tokens, so the work
+grows with the number of plausible pairs instead of with the product of
+the catalog sizes. Candidates are scored by the Jaccard similarity of
+their token sets.
+
+Two names with Jaccard similarity ``t`` or more share at least
+``ceil(t * n)`` of the ``n`` tokens of either, so probing the
+``n - ceil(t * n) + 1`` rarest tokens finds all of them (prefix
+filtering). Tokens that occur in more than ``max_posting`` names, like
+"free" or "app", are skipped while a rarer token is left to probe.
+"""
+
+import math
+import re
+import unicodedata
+
+from app_profiles.table import AppTable
+
+_SEPARATORS = re.compile(r'[\W_]+')
+
+
+def normalize_name(name):
+    """Return ``name`` lower-cased, without accents, symbols or emojis, and
+    with punctuation collapsed to single spaces."""
+    # Symbols go before decomposing, or NFKD would turn ™ into 'TM'.
+    name = ''.join(character for character in name
+                   if unicodedata.category(character)[0] != 'S')
+    # Accents decompose into combining marks, which are dropped, while
+    # punctuation becomes a space so 'Facebook-Messenger' keeps two words.
+    characters = []
+    for character in unicodedata.normalize('NFKD', name):
+        category = unicodedata.category(character)[0]
+        if category in 'LNZ':
+            characters.append(character)
+        elif category == 'P':
+            characters.append(' ')
+    kept = ''.join(characters)
+    return ' '.join(_SEPARATORS.split(kept.lower())).strip()
+
+
+def _names(dataset, name_col):
+    if isinstance(dataset, AppTable):
+        return dataset.column(name_col)
+    return (row[name_col] for row in dataset)
+
+
+class NameIndex:
+    """Inverted token index over the names of one catalog."""
+
+    def __init__(self, names, max_posting=1000):
+        self.max_posting = max_posting
+        self.tokens = []
+        self.exact = {}
+        self.postings = {}
+        for row_id, name in enumerate(names):
+            normalized = normalize_name(name)
+            tokens = frozenset(normalized.split())
+            self.tokens.append(tokens)
+            self.exact.setdefault(normalized, row_id)
+            for token in tokens:
+                self.postings.setdefault(token, []).append(row_id)
+
+    def candidates(self, tokens, threshold=0.75):
+        """Row ids that may have a Jaccard similarity of ``threshold`` or
+        more with ``tokens``: those sharing one of its rarest tokens."""
+        # The epsilon keeps 0.7 * 10 == 7.000000000000001 from rounding up.
+        n_probe = len(tokens) - math.ceil(threshold * len(tokens) - 1e-9) + 1
+        postings = self.postings
+        prefix = sorted((len(postings.get(token, ())), token)
+                        for token in tokens)[:n_probe]
+        probed = [token for size, token in prefix
+                  if 0 < size <= self.max_posting]
+        if not probed:
+            probed = [token for size, token in prefix if size]
+        found = set()
+        for token in probed:
+            found.update(postings[token])
+        return found
+
+    def best_match(self, name, threshold=0.75):
+        """Return ``(row_id, score)`` of the most similar name, or None."""
+        normalized = normalize_name(name)
+        row_id = self.exact.get(normalized)
+        if row_id is not None and normalized:
+            return row_id, 1.0
+        tokens = frozenset(normalized.split())
+        best = None
+        for candidate in self.candidates(tokens, threshold):
+            other = self.tokens[candidate]
+            score = len(tokens & other) / len(tokens | other)
+            if score >= threshold and (
+                    best is None or score > best[1]
+                    or (score == best[1] and candidate < best[0])):
+                best = (candidate, score)
+        return best
+
+
+def match_apps(android, ios, android_name_col=0, ios_name_col=1,
+               threshold=0.75, max_posting=1000):
+    """Return ``[(android_row_id, ios_row_id, score), ...]`` pairing every
+    Android app with its most similar iOS app scoring at least
+    ``threshold`` (1.0 for identical normalized names).
+
+    ``android`` and ``ios`` are lists of rows or ``AppTable`` objects.
+    """
+    index = NameIndex(_names(ios, ios_name_col), max_posting)
+    matches = []
+    for row_id, name in enumerate(_names(android, android_name_col)):
+        found = index.best_match(name, threshold)
+        if found is not None:
+            matches.append((row_id, found[0], found[1]))
+    return matches
@@ -0,0 +1,137 @@
+"""Memoized aggregate results for interactive exploration.
+
+``freq_table`` and ``group_aggregate`` are wrapped with ``memoized(name)``.
+Their results are kept in the module-level ``result_cache``, an LRU
+cache keyed by the function, the data set and the remaining arguments, so
+``display_table(android_final, 1)`` followed by
+``freq_table(android_final, 1)`` counts the column only once.
+
+A data set is identified by ``id()`` plus its ``version`` attribute.
+Only objects that bump ``version`` themselves when they change
+(``AppTable``) are cached, and their entries are dropped when they are
+garbage collected. Plain lists of rows can be edited in place without
+anything noticing, so they, like generators, are never cached.
+"""
+
+import functools
+import inspect
+import os
+import weakref
+from collections import OrderedDict
+
+
+class ResultCache:
+    def __init__(self, maxsize=128, enabled=True):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # key -> result
+        self._entries = OrderedDict()
+        self._finalizers = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def _version(self, dataset):
+        """Return the version of ``dataset`` or None if it can't be
+        cached."""
+        version = getattr(dataset, 'version', None)
+        if version is None:
+            return None
+        ident = id(dataset)
+        if ident not in self._finalizers:
+            try:
+                self._finalizers[ident] = weakref.finalize(
+                    dataset, self._forget, ident)
+            except TypeError:
+                return None
+        return version
+
+    def _forget(self, ident):
+        self._finalizers.pop(ident, None)
+        for key in [key for key in self._entries if key[1] == ident]:
+            del self._entries[key]
+
+    def invalidate(self, dataset=None):
+        """Drop the results for ``dataset``, or every result."""
+        if dataset is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries
+                        if key[1] == id(dataset)]:
+                del self._entries[key]
+
+    def call(self, name, function, key_args, args, kwargs):
+        dataset = args[0]
+        version = self._version(dataset) if self.enabled else None
+        if version is None:
+            return function(*args, **kwargs)
+        key = (name, id(dataset), version, key_args)
+        try:
+            entry = self._entries.get(key)
+        except TypeError:  # unhashable argument, e.g. a list of aggregates
+            return function(*args, **kwargs)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        result = function(*args, **kwargs)
+        # results for older versions of this data set can't be hit again
+        for old in [old for old in self._entries
+                    if old[1] == key[1] and old[2] != version]:
+            del self._entries[old]
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+def _key_args(signature, columns, args, kwargs):
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    name_of = getattr(args[0], 'name_of', None)
+    key = []
+    for parameter, value in list(bound.arguments.items())[1:]:
+        kind = signature.parameters[parameter].kind
+        if kind is inspect.Parameter.VAR_KEYWORD:
+            value = tuple(sorted(value.items()))
+        elif parameter in columns and name_of is not None:
+            value = name_of(value)
+        key.append(value)
+    return tuple(key)
+
+
+def memoized(name, copy=dict, columns=()):
+    """Cache the results of ``function(dataset, ...)`` in ``result_cache``.
+
+    Calls that differ only in spelling (a default passed explicitly or
+    a keyword given by position) share an entry, and so do the position
+    and the header name of a column when the parameters named in
+    ``columns`` are given one on an ``AppTable``. ``copy`` is applied to
+    every result handed out so callers can't change the cached one.
+    """
+    def decorate(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key_args = _key_args(signature, columns, args, kwargs)
+            return copy(result_cache.call(name, function, key_args, args,
+                                          kwargs))
+        return wrapper
+    return decorate
+
+
+result_cache = ResultCache(
+    enabled=not os.environ.get('APP_PROFILES_NO_MEMO'))
@@ -0,0 +1,223 @@
+"""Process-pool version of the cleaning and profiling steps.
+
+The csv file is cut into byte ranges that start at line boundaries. Each
+worker parses its range, drops the rows ``validate_rows`` rejects and the
+non-English ones, and sends back a compact summary instead of the rows:
+where every kept record sits in the file, and for Google Play the name,
+review count, free flag and counted column values of the most reviewed
+entry of every app it saw. Pickling the rows made the parent's share of
+the work, unpickling and merging them, as long as the serial pass.
+
+The parent merges the summaries in chunk order, so the counts and rows
+come out exactly as the serial ``clean_android`` / ``clean_ios`` produce
+them. The kept rows are parsed again from their byte offsets only when
+``keep_rows`` is set; that part runs in the parent, so a profile without
+the rows is what scales with the number of workers.
+
+Byte-range splitting assumes that no quoted field contains a line break,
+which holds for both store files.
+"""
+
+import os
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from csv import reader
+from itertools import accumulate, repeat
+
+from app_profiles.english import is_english
+from app_profiles.load import ANDROID, IOS
+from app_profiles.parse import parse_price, price_equals
+from app_profiles.validate import android_rules, ios_rules, validate_tagged
+
+STORES = {'android': ANDROID, 'ios': IOS}
+RULES = {'android': android_rules, 'ios': ios_rules}
+
+
+def chunk_ranges(path, n_chunks):
+    """Return ``(header_end, [(start, end), ...])`` byte ranges of the
+    rows after the header, each starting at the beginning of a line."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as opened_file:
+        opened_file.readline()
+        header_end = opened_file.tell()
+        offsets = [header_end]
+        for k in range(1, n_chunks):
+            target = header_end + (size - header_end) * k // n_chunks
+            if target <= offsets[-1]:
+                continue
+            opened_file.seek(target - 1)
+            opened_file.readline()
+            offset = opened_file.tell()
+            if offsets[-1] < offset < size:
+                offsets.append(offset)
+    offsets.append(size)
+    return header_end, list(zip(offsets, offsets[1:]))
+
+
+def _read_header(path, encoding):
+    with open(path, encoding=encoding, newline='') as opened_file:
+        return next(reader(opened_file))
+
+
+def _read_lines(path, start, end):
+    with open(path, 'rb') as opened_file:
+        opened_file.seek(start)
+        return opened_file.read(end - start).splitlines(keepends=True)
+
+
+def _profile_chunk(task):
+    """Return the summary of one byte range: ``(starts, lengths, counts)``
+    of the kept App Store rows, or ``(starts, lengths, names, reviews,
+    free_ids, values)`` of the Google Play entries it keeps per app.
+
+    ``starts`` and ``lengths`` locate every record relative to ``start``.
+    """
+    path, start, end, store, header, max_non_ascii, columns, encoding = task
+    spec = STORES[store]
+    name_col = spec['name']
+    price_col = spec['price']
+    free_price = parse_price(spec['free_price'])
+
+    lines = _read_lines(path, start, end)
+    rows = reader(map(bytes.decode, lines, repeat(encoding)))
+    # one line per record, so line numbers tag the rows
+    tagged = validate_tagged(enumerate(rows), header, RULES[store]())
+    line_lengths = list(map(len, lines))
+    line_starts = [0]
+    line_starts.extend(accumulate(line_lengths))
+
+    if store == 'ios':
+        kept_lines = []
+        counts = {column: Counter() for column in columns}
+        for line, row in tagged:
+            if (price_equals(row[price_col], free_price)
+                    and is_english(row[name_col], max_non_ascii)):
+                kept_lines.append(line)
+                for column in columns:
+                    counts[column][row[column]] += 1
+        return (array('q', [line_starts[line] for line in kept_lines]),
+                array('q', [line_lengths[line] for line in kept_lines]),
+                counts)
+
+    reviews_col = spec['reviews']
+    best = {}
+    for line, row in tagged:
+        name = row[name_col]
+        if not is_english(name, max_non_ascii):
+            continue
+        n_reviews = float(row[reviews_col])
+        kept = best.get(name)
+        if kept is None or kept[0] < n_reviews:
+            best[name] = (n_reviews, line, row)
+
+    entries = sorted(best.values(), key=lambda entry: entry[1])
+    free_ids = array('l', [
+        entry_id for entry_id, (_, _, row) in enumerate(entries)
+        if price_equals(row[price_col], free_price)])
+    # Interned values pickle once per distinct value instead of per row.
+    values = {column: [sys.intern(row[column]) for _, _, row in entries]
+              for column in columns}
+    return (array('q', [line_starts[line] for _, line, _ in entries]),
+            array('q', [line_lengths[line] for _, line, _ in entries]),
+            [row[name_col] for _, _, row in entries],
+            array('d', [n_reviews for n_reviews, _, _ in entries]),
+            free_ids, values)
+
+
+def _merge_android(partials, columns):
+    """Merge per-chunk winners and return, per chunk, the ids of its free
+    entries that are still kept, along with the counts over them."""
+    # Entries are numbered across all chunks, in file order.
+    best = {}
+    reviews = array('d')
+    lost = set()
+    firsts = []
+    for partial in partials:
+        names = partial[2]
+        first = len(reviews)
+        firsts.append(first)
+        chunk = dict(zip(names, range(first, first + len(names))))
+        reviews.extend(partial[3])
+        for name in chunk.keys() & best.keys():
+            kept, entry = best[name], chunk[name]
+            # Chunks arrive in file order, so on a tie the kept entry is
+            # the earlier one, as in the serial pass.
+            if reviews[kept] < reviews[entry]:
+                lost.add(kept)
+            else:
+                lost.add(entry)
+                chunk[name] = kept
+        best.update(chunk)
+
+    kept_ids = []
+    counts = {column: Counter() for column in columns}
+    for partial, first in zip(partials, firsts):
+        free_ids, values = partial[4], partial[5]
+        if lost:
+            free_ids = [entry_id for entry_id in free_ids
+                        if first + entry_id not in lost]
+        kept_ids.append(free_ids)
+        for column in columns:
+            counts[column].update(map(values[column].__getitem__, free_ids))
+    return kept_ids, counts
+
+
+def _read_rows(path, ranges, spans, encoding):
+    """Parse the records at ``spans``, ``(starts, lengths)`` per chunk."""
+    rows = []
+    for (start, end), (starts, lengths) in zip(ranges, spans):
+        if not starts:
+            continue
+        first = starts[0]
+        with open(path, 'rb') as opened_file:
+            opened_file.seek(start + first)
+            data = opened_file.read(starts[-1] + lengths[-1] - first)
+        lines = [data[offset - first:offset - first + length]
+                 for offset, length in zip(starts, lengths)]
+        rows.extend(reader(map(bytes.decode, lines, repeat(encoding))))
+    return rows
+
+
+def profile_parallel(path, store, columns=(), workers=None,
+                     max_non_ascii=3, encoding='utf8', keep_rows=True):
+    """Clean a store file on a process pool.
+
+    Returns ``(header, rows, counts)`` where ``rows`` are the free, English
+    (and, for Google Play, de-duplicated) apps in the same order as the
+    serial pipeline and ``counts`` maps every column index in ``columns``
+    to ``{value: count}`` over those rows, in first-seen order. With
+    ``keep_rows=False`` only the counts are computed and ``rows`` is None.
+    """
+    workers = workers or os.cpu_count() or 1
+    header = _read_header(path, encoding)
+    columns = tuple(columns)
+    _, ranges = chunk_ranges(path, workers * 4)
+    tasks = [(path, start, end, store, header, max_non_ascii, columns,
+              encoding) for start, end in ranges]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = list(executor.map(_profile_chunk, tasks))
+
+    if store == 'ios':
+        kept = [(starts, lengths) for starts, lengths, _ in partials]
+        counts = {column: Counter() for column in columns}
+        for _, _, chunk_counts in partials:
+            for column in columns:
+                counts[column].update(chunk_counts[column])
+    else:
+        kept_ids, counts = _merge_android(partials, columns)
+        kept = [(partial[0], partial[1], ids)
+                for partial, ids in zip(partials, kept_ids)]
+
+    # Counters keep their keys in first-seen order and chunks are merged
+    # in file order, so the counts are already ordered like the rows.
+    counts = {column: dict(counts[column]) for column in columns}
+    if not keep_rows:
+        return header, None, counts
+    if store == 'android':
+        kept = [([starts[entry_id] for entry_id in ids],
+                 [lengths[entry_id] for entry_id in ids])
+                for starts, lengths, ids in kept]
+    return header, _read_rows(path, ranges, kept, encoding), counts
@@ -0,0 +1,73 @@
+"""Parsing the numeric columns of the store files.
+
+Installs ('1,000,000+'), Reviews, Price ('0', '$4.99', '0.0') and
+rating_count_tot arrive as strings. ``parse_column`` converts a whole
+column at once with ``array(typecode, map(parser, values))``, which runs
+the loop in C, and only falls back to a per-value loop when some value
+does not parse. Such values are stored as NaN (0 for integer columns) and
+reported in ``bad_values`` as ``(row_id, column, value)`` instead of
+raising; ``AppTable`` keeps that list so the analyses skip those rows
+rather than count them as zeros.
+"""
+
+from array import array
+
+
+def parse_installs(value):
+    """Turn an install tier such as '1,000,000+' into 1000000.0."""
+    return float(value.replace(',', '').replace('+', ''))
+
+
+def parse_price(value):
+    """Turn a price such as '0', '0.0' or '$4.99' into a float."""
+    return float(value.replace('$', '').replace(',', ''))
+
+
+def memoize(parser):
+    """Cache ``parser`` per distinct value, for low-cardinality columns
+    such as prices or install tiers. Values that fail are not cached."""
+    cache = {}
+
+    def parse(value):
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = parser(value)
+            return result
+
+    return parse
+
+
+_price = memoize(parse_price)
+
+
+def price_equals(value, price):
+    """Return True if the price string ``value`` equals ``price``; prices
+    that don't parse never match."""
+    try:
+        return _price(value) == price
+    except ValueError:
+        return False
+
+
+def missing_value(typecode):
+    return float('nan') if typecode in 'fd' else 0
+
+
+def parse_column(values, parser, typecode='d', column=None, bad_values=None):
+    """Convert a sequence of strings into an ``array(typecode)``."""
+    try:
+        return array(typecode, map(parser, values))
+    except (ValueError, OverflowError):
+        pass
+
+    missing = missing_value(typecode)
+    parsed = array(typecode)
+    for row_id, value in enumerate(values):
+        try:
+            parsed.append(parser(value))
+        except (ValueError, OverflowError):
+            parsed.append(missing)
+            if bad_values is not None:
+                bad_values.append((row_id, column, value))
+    return parsed
@@ -0,0 +1,92 @@
+"""Compact record types for app rows.
+
+A row read by ``csv.reader`` is a list holding a separate string object
+for every field, even though values such as the category, install tier,
+content rating or genre repeat across thousands of apps. ``AndroidApp``
+and ``IosApp`` store the fields in ``__slots__`` (no per-row ``__dict__``
+or list) and intern the repeated fields with ``sys.intern`` so every row
+shares one string per distinct value. Records can still be indexed like
+the original rows (``app[0]``, ``app[-5]``), so ``explore_data``,
+``freq_table``, ``deduplicate`` and the filters work on them unchanged.
+"""
+
+import sys
+
+from app_profiles.instrument import instrumented
+
+
+class Record:
+    __slots__ = ()
+    # Field names in csv column order and those worth interning.
+    fields = ()
+    interned = frozenset()
+
+    def __init__(self, *values):
+        if len(values) != len(self.fields):
+            raise ValueError('{} expects {} fields, got {}'.format(
+                type(self).__name__, len(self.fields), len(values)))
+        for field, value in zip(self.fields, values):
+            setattr(self, field, value)
+
+    @classmethod
+    def from_row(cls, row):
+        interned = cls.interned
+        return cls(*[sys.intern(value) if field in interned else value
+                     for field, value in zip(cls.fields, row)])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [getattr(self, field) for field in self.fields[index]]
+        return getattr(self, self.fields[index])
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __iter__(self):
+        for field in self.fields:
+            yield getattr(self, field)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(field, value)
+            for field, value in zip(self.fields, self)))
+
+    def __getstate__(self):
+        return list(self)
+
+    def __setstate__(self, state):
+        for field, value in zip(self.fields, state):
+            setattr(self, field, value)
+
+
+class AndroidApp(Record):
+    fields = ('name', 'category', 'rating', 'reviews', 'size', 'installs',
+              'type', 'price', 'content_rating', 'genres', 'last_updated',
+              'current_ver', 'android_ver')
+    __slots__ = fields
+    interned = frozenset(fields) - {'name', 'reviews'}
+
+
+class IosApp(Record):
+    fields = ('id', 'track_name', 'size_bytes', 'currency', 'price',
+              'rating_count_tot', 'rating_count_ver', 'user_rating',
+              'user_rating_ver', 'ver', 'cont_rating', 'prime_genre',
+              'sup_devices_num', 'ipad_sc_urls_num', 'lang_num', 'vpp_lic')
+    __slots__ = fields
+    interned = frozenset(fields) - {'id', 'track_name', 'size_bytes',
+                                    'rating_count_tot', 'rating_count_ver'}
+
+
+@instrumented('records')
+def as_records(rows, record_type):
+    """Convert well-formed rows (see ``drop_malformed``) to records."""
+    from_row = record_type.from_row
+    for row in rows:
+        yield from_row(row)
@@ -0,0 +1,168 @@
+"""Collect analysis results and render them in one go.
+
+A ``Report`` holds named sections per store: single values (the number
+of apps), frequency tables (``{key: value}``), group aggregates
+(``{key: {aggregate: value}}``) and lists of rows, such as the
+``(name, value)`` rows of a drill-down. Rendering builds the whole
+document in memory and writes it with a single call instead of printing
+line by line. For csv output every section is a file of its own, and the
+sections are rendered and written concurrently.
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+FORMATS = ('text', 'json', 'markdown', 'csv')
+
+
+class Section:
+    def __init__(self, store, name, data, columns=None):
+        self.store = store
+        self.name = name
+        self.data = data
+        self.columns = columns
+
+    @property
+    def is_value(self):
+        return not isinstance(self.data, (dict, list, tuple))
+
+    def header(self):
+        if self.columns is not None:
+            return list(self.columns)
+        if self.is_value:
+            return ['value']
+        if isinstance(self.data, dict):
+            first = next(iter(self.data.values()), None)
+            if isinstance(first, dict):
+                return [self.name] + list(first)
+            return [self.name, 'value']
+        # (key, value) rows, such as drill-downs, read like a dict's
+        first = next(iter(self.data), None)
+        if first is not None and len(first) == 2:
+            return [self.name, 'value']
+        return []
+
+    def rows(self):
+        """Return the section as a list of rows, without the header."""
+        if self.is_value:
+            return [[self.data]]
+        if isinstance(self.data, dict):
+            rows = []
+            for key, value in self.data.items():
+                if isinstance(value, dict):
+                    rows.append([key] + list(value.values()))
+                else:
+                    rows.append([key, value])
+            return rows
+        return [list(row) for row in self.data]
+
+
+class Report:
+    def __init__(self):
+        self.sections = []
+
+    def add(self, store, name, data, columns=None):
+        """Add a section; ``columns`` names the fields of a list of rows."""
+        section = Section(store, name, data, columns)
+        self.sections.append(section)
+        return section
+
+    @classmethod
+    def from_results(cls, results):
+        """Build a report from ``{store: {section: data}}``, the shape
+        ``analyze_android`` / ``analyze_ios`` return."""
+        report = cls()
+        for store, sections in results.items():
+            for name, data in sections.items():
+                report.add(store, name, data)
+        return report
+
+    def to_dict(self):
+        results = {}
+        for section in self.sections:
+            results.setdefault(section.store, {})[section.name] = section.data
+        return results
+
+    def write(self, destination, format='text', max_workers=4):
+        """Render the report as ``format``.
+
+        ``destination`` is a stream or a file path. For csv it is a
+        directory, created if needed, that gets one ``<store>_<section>.csv``
+        file per section; the paths written are returned.
+        """
+        if format not in FORMATS:
+            raise ValueError('Unknown format: {!r}'.format(format))
+        if format == 'csv':
+            return write_csv(self, destination, max_workers)
+        if format == 'json':
+            document = json.dumps(self.to_dict(), indent=2) + '\n'
+        else:
+            render = render_markdown if format == 'markdown' else render_text
+            with ThreadPoolExecutor(max_workers) as executor:
+                document = ''.join(executor.map(render, self.sections))
+
+        if isinstance(destination, str):
+            with open(destination, 'w', encoding='utf8') as opened_file:
+                opened_file.write(document)
+        else:
+            destination.write(document)
+        return [destination]
+
+
+def render_text(section):
+    if section.is_value:
+        return '{} {}: {}\n'.format(section.store, section.name, section.data)
+    lines = ['\n{} {}\n'.format(section.store, section.name)]
+    for row in section.rows():
+        lines.append(' : '.join(map(str, row)) + '\n')
+    return ''.join(lines)
+
+
+def _cell(value):
+    return str(value).replace('|', '\\|')
+
+
+def render_markdown(section):
+    if section.is_value:
+        return '**{} {}:** {}\n\n'.format(section.store, section.name,
+                                          section.data)
+    header = section.header()
+    lines = ['## {} {}\n\n'.format(section.store, section.name),
+             '| ' + ' | '.join(map(_cell, header)) + ' |\n',
+             '|' + ' --- |' * len(header) + '\n']
+    for row in section.rows():
+        lines.append('| ' + ' | '.join(map(_cell, row)) + ' |\n')
+    lines.append('\n')
+    return ''.join(lines)
+
+
+def render_csv(section):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(section.header())
+    writer.writerows(section.rows())
+    return buffer.getvalue()
+
+
+def _file_name(section):
+    name = '{}_{}'.format(section.store, section.name)
+    return ''.join(character if character.isalnum() or character in '-_'
+                   else '_' for character in name) + '.csv'
+
+
+def write_csv(report, directory, max_workers=4):
+    """Write every section of ``report`` to its own csv file in
+    ``directory``, concurrently; return the paths written."""
+    os.makedirs(directory, exist_ok=True)
+
+    def write(section):
+        path = os.path.join(directory, _file_name(section))
+        with open(path, 'w', encoding='utf8', newline='') as opened_file:
+            opened_file.write(render_csv(section))
+        return path
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(write, report.sections))
@@ -0,0 +1,122 @@
+"""Outlier-robust popularity figures for every group of a data set.
+
+A handful of giants (WhatsApp, Google Maps, Facebook, ...) pull the mean
+installs or rating counts of their category far above what a typical
+app in it gets. ``popularity`` collects the values of every group in one
+pass, sorts each group once and reads every order statistic from that
+sorted list: median, quartiles, a trimmed mean, the median absolute
+deviation, and Tukey's fences. Values beyond the fences are the group's
+outliers, and ``robust_mean`` is the mean of the remaining values. This
+replaces leaving out apps above a hand-picked threshold one category at
+a time.
+"""
+
+from app_profiles.groupby import _pairs
+from app_profiles.instrument import instrumented
+from app_profiles.memo import memoized
+from app_profiles.table import AppTable
+
+
+def quantile(values, fraction):
+    """Return the ``fraction`` quantile of sorted ``values``, interpolating
+    linearly between the closest ranks (the median of an even number of
+    values is the mean of the middle two, as with ``statistics.median``)."""
+    position = (len(values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def trimmed_mean(values, trim=0.1):
+    """Mean of sorted ``values`` without the lowest and highest ``trim``
+    share of them."""
+    cut = int(len(values) * trim)
+    kept = values[cut:len(values) - cut] or values
+    return sum(kept) / len(kept)
+
+
+def summarize(values, trim=0.1, fence=3.0):
+    """Return the robust statistics of sorted ``values``; values more than
+    ``fence`` interquartile ranges outside the quartiles are outliers."""
+    n = len(values)
+    median = quantile(values, 0.5)
+    q1 = quantile(values, 0.25)
+    q3 = quantile(values, 0.75)
+    iqr = q3 - q1
+    deviations = sorted(abs(value - median) for value in values)
+    low, high = q1 - fence * iqr, q3 + fence * iqr
+    kept = [value for value in values if low <= value <= high]
+    return {
+        'count': n,
+        'mean': sum(values) / n,
+        'median': median,
+        'trimmed_mean': trimmed_mean(values, trim),
+        'q1': q1,
+        'q3': q3,
+        'iqr': iqr,
+        'mad': quantile(deviations, 0.5),
+        'lower_fence': low,
+        'upper_fence': high,
+        'outliers': n - len(kept),
+        'robust_mean': sum(kept) / len(kept),
+    }
+
+
+def _copy(groups):
+    copied = {}
+    for key, stats in groups.items():
+        stats = dict(stats)
+        if 'outlier_names' in stats:
+            stats['outlier_names'] = list(stats['outlier_names'])
+        copied[key] = stats
+    return copied
+
+
+@memoized('popularity', columns=('key_index', 'value_fn', 'name_index'),
+          copy=_copy)
+@instrumented('popularity')
+def popularity(dataset, key_index, value_fn, trim=0.1, fence=3.0,
+               name_index=None):
+    """Return ``{key: statistics}`` (see ``summarize``) for every group of
+    column ``key_index``.
+
+    ``value_fn`` is a column or a callable, as for ``group_aggregate``;
+    rows where it gives None or NaN are skipped. With ``name_index`` the
+    statistics also list the ``outlier_names``, largest value first;
+    ``dataset`` then has to be an ``AppTable`` or a list of rows.
+    """
+    names = None
+    if name_index is not None:
+        if isinstance(dataset, AppTable):
+            names = dataset.column(name_index)
+        else:
+            names = [row[name_index] for row in dataset]
+
+    values_by_key = {}
+    ids_by_key = {}
+    for row_id, (key, value) in enumerate(
+            _pairs(dataset, key_index, value_fn)):
+        if value is None or value != value:
+            continue
+        values = values_by_key.get(key)
+        if values is None:
+            values = values_by_key[key] = []
+            ids_by_key[key] = []
+        values.append(value)
+        ids_by_key[key].append(row_id)
+
+    groups = {}
+    for key, values in values_by_key.items():
+        if names is None:
+            values.sort()
+            groups[key] = summarize(values, trim, fence)
+            continue
+        order = sorted(range(len(values)), key=values.__getitem__)
+        stats = groups[key] = summarize(
+            [values[position] for position in order], trim, fence)
+        low, high = stats['lower_fence'], stats['upper_fence']
+        ids = ids_by_key[key]
+        stats['outlier_names'] = [
+            names[ids[position]] for position in reversed(order)
+            if not low <= values[position] <= high]
+    return groups
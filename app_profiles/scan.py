@@ -0,0 +1,153 @@
+"""Memory-mapped csv scanning that only decodes the columns asked for.
+
+``csv.reader`` on a text file decodes the whole file and makes a ``str``
+of every field, including the Size, Last Updated or sup_devices.num
+columns the analysis never reads, and keeping those rows keeps all of
+them alive. ``scan_csv`` maps the file into memory and cuts it into
+chunks of whole records. A record without any quote character is split
+as bytes and only its projected fields are decoded. Only records with
+quotes are decoded and handed to ``csv.reader``, which handles
+separators, escaped quotes ('""') and line breaks inside quoted fields;
+consecutive ones are handed over together, and the records around them
+stay on the byte path. Either way the rows produced hold only the
+projected strings.
+
+The byte path is what makes App Store files faster to scan than to read
+with ``stream_rows``. Google Play files get no speedup: every record has
+a quoted field with a comma, since Last Updated reads 'January 7, 2018',
+so they all go through ``csv.reader`` and scanning them is a little
+slower than ``stream_rows`` (up to 10%). They only gain memory, because
+the rows they produce hold the projected fields alone. Splitting quoted
+records on bytes in Python was tried and measured slower than
+``csv.reader``.
+
+Only ASCII-compatible encodings (utf8, latin-1, ...) can be scanned this
+way, since records are found by looking for the ',' '"' and newline bytes.
+"""
+
+import csv
+import io
+import mmap
+import os
+from itertools import repeat
+from operator import itemgetter
+
+from app_profiles.instrument import instrumented
+
+# the columns the analysis reads, including the ratings checked by
+# ``android_rules`` / ``ios_rules``
+ANDROID_COLUMNS = ('App', 'Category', 'Rating', 'Reviews', 'Installs',
+                   'Price', 'Genres')
+IOS_COLUMNS = ('track_name', 'price', 'rating_count_tot', 'user_rating',
+               'prime_genre')
+
+
+def _chunks(buffer, start, chunk_size):
+    """Yield chunks of ``buffer`` that end after a line break outside
+    quotes, so every chunk holds whole records."""
+    size = len(buffer)
+    while start < size:
+        end = start + chunk_size
+        while True:
+            end = buffer.find(b'\n', min(end, size - 1))
+            end = size if end == -1 else end + 1
+            chunk = buffer[start:end]
+            if end == size or not chunk.count(b'"') % 2:
+                break
+        yield chunk
+        start = end
+
+
+def _pieces(chunk):
+    """Return ``(False, line)`` for the lines of ``chunk`` without quotes
+    and ``(True, text)`` for the lines between them, which are left to
+    csv.reader in one piece. A line without quotes inside a quoted field
+    (an odd number of quotes before it) joins that piece, and so does a
+    line with a lone '\\r', which csv.reader treats as a line break."""
+    if b'"' not in chunk:
+        chunk = chunk.replace(b'\r\n', b'\n')
+        if b'\r' not in chunk:
+            lines = chunk.split(b'\n')
+            if not lines[-1]:
+                lines.pop()
+            return [(False, line) for line in lines]
+
+    lines = chunk.split(b'\n')
+    if not lines[-1]:
+        lines.pop()
+    plain = [position for position, line in enumerate(lines)
+             if b'"' not in line]
+    pieces = []
+    run_start = 0
+    for position in plain:
+        line = lines[position]
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        if b'\r' in line:
+            continue
+        if run_start < position:
+            run = b'\n'.join(lines[run_start:position])
+            if run.count(b'"') % 2:
+                continue
+            pieces.append((True, run))
+        run_start = position + 1
+        pieces.append((False, line))
+    if run_start < len(lines):
+        pieces.append((True, chunk if not run_start
+                       else b'\n'.join(lines[run_start:])))
+    return pieces
+
+
+@instrumented('scan', rows_arg=None)
+def _scan(buffer, start, positions, n_columns, encoding, bad_rows,
+          chunk_size):
+    project = itemgetter(*positions) if len(positions) > 1 else (
+        lambda fields: (fields[positions[0]],))
+    encodings = repeat(encoding)
+
+    with buffer:
+        for chunk in _chunks(buffer, start, chunk_size):
+            for quoted, text in _pieces(chunk):
+                if quoted:
+                    for fields in csv.reader(io.StringIO(
+                            text.decode(encoding), newline='')):
+                        if len(fields) == n_columns:
+                            yield list(project(fields))
+                        elif bad_rows is not None:
+                            bad_rows.append(fields)
+                    continue
+                fields = text.split(b',')
+                if len(fields) == n_columns:
+                    yield list(map(bytes.decode, project(fields), encodings))
+                elif bad_rows is not None:
+                    bad_rows.append(list(map(bytes.decode, fields,
+                                             encodings)))
+
+
+def scan_csv(path, columns, encoding='utf8', bad_rows=None,
+             chunk_size=1 << 20):
+    """Return ``(columns, rows)`` with only ``columns`` of a csv file.
+
+    ``columns`` are header names, in the order the projected rows should
+    have them. Records that don't have as many fields as the header are
+    skipped, and appended (fully decoded) to ``bad_rows`` when a list is
+    given. Like ``stream_rows`` the file is read lazily and closed once
+    every row has been read. A file without even a header line raises
+    ValueError, since it has none of ``columns``.
+    """
+    with open(path, 'rb') as opened_file:
+        if not os.fstat(opened_file.fileno()).st_size:
+            raise ValueError('{} is empty, it has no header'.format(path))
+        buffer = mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ)
+    header_end = buffer.find(b'\n') + 1 or len(buffer)
+    header = next(csv.reader(
+        [buffer[:header_end].decode(encoding).rstrip('\r\n')]))
+    missing = [name for name in columns if name not in header]
+    if missing:
+        buffer.close()
+        raise ValueError('Header has no column {}'.format(
+            ', '.join(map(repr, missing))))
+
+    positions = [header.index(name) for name in columns]
+    return list(columns), _scan(buffer, header_end, positions, len(header),
+                                encoding, bad_rows, chunk_size)
@@ -0,0 +1,138 @@
+"""Fixed-memory frequency and distinct-value sketches.
+
+``CountMinSketch`` never under-counts; with probability ``1 - delta`` it
+over-counts a value by at most ``epsilon`` times the number of rows.
+``HyperLogLog`` estimates the number of distinct values with a relative
+standard error of about ``1.04 / sqrt(2 ** precision)``. Values are hashed
+with BLAKE2b rather than ``hash()`` so sketches built in different
+processes agree and can be merged.
+"""
+
+import math
+from array import array
+from hashlib import blake2b
+
+
+def hash_pair(value):
+    """Return two 64-bit hashes of ``value`` (the second one odd)."""
+    digest = blake2b(str(value).encode('utf8', 'surrogatepass'),
+                     digest_size=16).digest()
+    return (int.from_bytes(digest[:8], 'little'),
+            int.from_bytes(digest[8:], 'little') | 1)
+
+
+class CountMinSketch:
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.total = 0
+        self.rows = [array('q', bytes(8 * self.width))
+                     for _ in range(self.depth)]
+
+    def _columns(self, hashes):
+        # Kirsch-Mitzenmacher: the row hashes are derived from two hashes.
+        first, second = hashes
+        width = self.width
+        return [(first + row * second) % width for row in range(self.depth)]
+
+    def add(self, value, count=1, hashes=None):
+        """Count ``value`` and return its new estimate; ``hashes`` from
+        ``hash_pair`` can be passed to avoid hashing the value again."""
+        self.total += count
+        estimate = None
+        for row, column in zip(self.rows,
+                               self._columns(hashes or hash_pair(value))):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate
+
+    def estimate(self, value, hashes=None):
+        return min(row[column] for row, column in zip(
+            self.rows, self._columns(hashes or hash_pair(value))))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('Count-Min sketches have different sizes')
+        self.total += other.total
+        for mine, theirs in zip(self.rows, other.rows):
+            for column, count in enumerate(theirs):
+                if count:
+                    mine[column] += count
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = bytearray(2 ** precision)
+
+    def add(self, value, hashes=None):
+        hashed = (hashes or hash_pair(value))[0]
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -rank
+                                       for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return estimate
+
+    def merge(self, other):
+        if self.precision != other.precision:
+            raise ValueError('HyperLogLog sketches have different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class ApproximateCounter:
+    """Frequency table of one column in fixed memory.
+
+    Counts go into a Count-Min sketch, distinct values into a HyperLogLog,
+    and the ``max_keys`` values with the highest estimated counts are kept
+    as the keys of the table.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, precision=14,
+                 max_keys=1000):
+        self.counts = CountMinSketch(epsilon, delta)
+        self.distinct = HyperLogLog(precision)
+        self.max_keys = max_keys
+        self.candidates = {}
+        self._smallest = 0
+
+    def add(self, value):
+        hashes = hash_pair(value)
+        estimate = self.counts.add(value, hashes=hashes)
+        self.distinct.add(value, hashes=hashes)
+        candidates = self.candidates
+        if value in candidates or len(candidates) < self.max_keys:
+            candidates[value] = estimate
+        elif estimate > self._smallest:
+            # _smallest is a lower bound: candidate estimates only grow.
+            smallest = min(candidates, key=candidates.get)
+            if estimate > candidates[smallest]:
+                del candidates[smallest]
+                candidates[value] = estimate
+            self._smallest = min(candidates.values())
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def table(self):
+        """Return ``{value: percentage}`` like ``freq_table``."""
+        total = self.counts.total
+        return {value: (self.counts.estimate(value) / total) * 100
+                for value in self.candidates}
+
+    def distinct_count(self):
+        return self.distinct.count()
@@ -0,0 +1,200 @@
+"""A compact, column-oriented copy of a cleaned data set.
+
+Rows read from the csv files are lists of strings, so every analysis pass
+has to parse the same fields again (``float(app[5])``, the installs
+``replace`` chain, ...). An ``AppTable`` converts them once: numeric
+columns become ``array('q')`` / ``array('d')`` and low-cardinality columns
+such as Category, Genres or prime_genre are stored as integer codes into a
+small list of distinct values. Everything else is kept as a plain list of
+strings. Values that don't parse are kept in ``bad_values`` so rows still
+read back as they were in the file.
+"""
+
+from array import array
+from collections import Counter
+
+from app_profiles.instrument import instrumented
+from app_profiles.parse import (
+    missing_value,
+    parse_column,
+    parse_installs,
+    parse_price,
+)
+
+# ``numeric`` maps a column to its parser and array typecode; ``derived``
+# adds numeric columns computed once per distinct value of a categorical
+# column.
+ANDROID_SCHEMA = {
+    'categorical': ('Category', 'Installs', 'Type', 'Price',
+                    'Content Rating', 'Genres', 'Android Ver'),
+    'numeric': {'Reviews': (int, 'q')},
+    'derived': {'n_installs': ('Installs', parse_installs),
+                'price_value': ('Price', parse_price)},
+}
+
+IOS_SCHEMA = {
+    'categorical': ('currency', 'price', 'cont_rating', 'prime_genre'),
+    'numeric': {'rating_count_tot': (int, 'q'),
+                'rating_count_ver': (int, 'q'),
+                'user_rating': (float, 'd'),
+                'user_rating_ver': (float, 'd')},
+    'derived': {'price_value': ('price', parse_price)},
+}
+
+
+class Categorical:
+    """A column stored as integer codes into a list of distinct values."""
+
+    def __init__(self, values=()):
+        self.categories = []
+        self.lookup = {}
+        self.codes = array('i')
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.lookup[value] = code
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def map(self, function, column=None, bad_values=None):
+        """Apply ``function`` to each distinct value once and return the
+        result for every row as an ``array('d')``. Rows whose value fails
+        to convert get NaN and are appended to ``bad_values``."""
+        converted = []
+        failed = set()
+        for code, value in enumerate(self.categories):
+            try:
+                converted.append(function(value))
+            except (ValueError, OverflowError):
+                converted.append(missing_value('d'))
+                failed.add(code)
+        if failed and bad_values is not None:
+            for row_id, code in enumerate(self.codes):
+                if code in failed:
+                    bad_values.append((row_id, column, self.categories[code]))
+        return array('d', [converted[code] for code in self.codes])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, position):
+        return self.categories[self.codes[position]]
+
+    def __iter__(self):
+        categories = self.categories
+        for code in self.codes:
+            yield categories[code]
+
+
+class AppTable:
+    """Typed columns built once from ``header`` and an iterable of rows.
+
+    Columns are looked up by header name or by position (negative
+    positions count from the end, as with ``app[-5]``). Iterating or
+    indexing the table still gives rows as lists of strings, so
+    ``explore_data`` and the other row-based helpers keep working.
+    """
+
+    def __init__(self, header, columns, bad_values=None):
+        self.header = list(header)
+        self.columns = columns
+        # {(column, row_id): original string} for values that didn't parse
+        self.bad_values = bad_values or {}
+        # bumped by touch(); memoized results are keyed by it
+        self.version = 0
+
+    @classmethod
+    @instrumented('table', rows_arg=2)
+    def from_rows(cls, header, rows, schema=None):
+        schema = schema or {}
+        categorical = set(schema.get('categorical', ()))
+        numeric = schema.get('numeric', {})
+        columns = []
+        for name in header:
+            columns.append(Categorical() if name in categorical else [])
+
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+
+        bad_values = []
+        columns = dict(zip(header, columns))
+        for name, (parser, typecode) in numeric.items():
+            columns[name] = parse_column(columns[name], parser, typecode,
+                                         name, bad_values)
+        for name, (source, function) in schema.get('derived', {}).items():
+            columns[name] = columns[source].map(function, name, bad_values)
+
+        return cls(header, columns, {
+            (column, row_id): value for row_id, column, value in bad_values})
+
+    def touch(self):
+        """Mark the table as changed after editing its columns in place."""
+        self.version += 1
+
+    def name_of(self, index):
+        if isinstance(index, int):
+            return self.header[index]
+        return index
+
+    def column(self, index):
+        return self.columns[self.name_of(index)]
+
+    def unparsed(self, index):
+        """Return ``{row_id: original string}`` for the values of a column
+        that didn't parse."""
+        name = self.name_of(index)
+        return {row_id: value for (column, row_id), value
+                in self.bad_values.items() if column == name}
+
+    def numbers(self, index):
+        """Return a numeric column with None where the value didn't parse,
+        which integer columns otherwise store as 0."""
+        values = self.column(index)
+        unparsed = self.unparsed(index)
+        if not unparsed:
+            return values
+        return [None if row_id in unparsed else value
+                for row_id, value in enumerate(values)]
+
+    def __len__(self):
+        return len(self.columns[self.header[0]]) if self.header else 0
+
+    def row(self, position):
+        row = []
+        bad_values = self.bad_values
+        for name in self.header:
+            if bad_values and (name, position) in bad_values:
+                row.append(bad_values[name, position])
+                continue
+            value = self.columns[name][position]
+            row.append(value if isinstance(value, str) else repr(value))
+        return row
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.row(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        return self.row(position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def counts(self, index):
+        """Return ``{value: count}`` for a column in first-seen order.
+        Values that didn't parse are counted as their original string."""
+        column = self.column(index)
+        if isinstance(column, Categorical):
+            counted = Counter(column.codes)
+            return {column.categories[code]: n for code, n in counted.items()}
+        unparsed = self.unparsed(index)
+        if unparsed:
+            column = [unparsed.get(row_id, value)
+                      for row_id, value in enumerate(column)]
+        return dict(Counter(column))
@@ -0,0 +1,240 @@
+"""Schema validation of the store files while they are streamed.
+
+Rows are checked in batches so the common case stays in C: the field
+counts of a batch are compared with ``map(len, batch)``, whole-number
+columns (Reviews, rating_count_tot) by calling ``isdigit()`` once on the
+joined values, and low-cardinality columns (Rating, Installs, Price,
+user_rating, ...) by subtracting the set of values already known to be
+good. A single value is only parsed the first time it is seen, and rows
+are only looked at one by one in a batch that actually holds a bad value.
+
+Each checked value still costs a pass over the batch, so the default
+rules only cover the columns the analysis reads; pass a longer list of
+rules to check more.
+
+Rejected rows are skipped, and can be collected in ``bad_rows`` and/or
+written to a quarantine csv file with the reason they were rejected.
+"""
+
+import csv
+from collections import deque
+from itertools import islice
+from operator import itemgetter
+
+from app_profiles.instrument import instrumented
+from app_profiles.parse import parse_installs, parse_price
+
+
+class Rule:
+    """Check applied to every value of one column.
+
+    ``test(value)`` returns None for a good value or the reason it is
+    bad. With ``cached=True`` the verdict for each distinct value is
+    remembered, which suits columns with few distinct values; otherwise
+    ``all_good(values)`` should tell in one call whether a whole batch of
+    values passes, so ``test`` is only run on batches that don't.
+    """
+
+    def __init__(self, column, test, cached=True, all_good=None):
+        self.column = column
+        self.test = test
+        self.cached = cached
+        self.all_good = all_good
+        self.good = set()
+        self.bad = {}
+
+    def passes(self, values):
+        """Return True if every value passes; False means "maybe not"."""
+        if self.cached:
+            return self.good.issuperset(values)
+        return self.all_good(list(values))
+
+    def failures(self, values):
+        """Return ``{offset: reason}`` for the bad values of a batch."""
+        if not self.cached:
+            failures = {}
+            for offset, value in enumerate(values):
+                reason = self.test(value)
+                if reason is not None:
+                    failures[offset] = reason
+            return failures
+
+        good, bad = self.good, self.bad
+        for value in set(values) - good:
+            if value not in bad:
+                reason = self.test(value)
+                if reason is None:
+                    good.add(value)
+                else:
+                    bad[value] = reason
+        return {offset: bad[value] for offset, value in enumerate(values)
+                if value in bad}
+
+
+def _all_digits(values):
+    return ''.join(values).isdigit() and '' not in values
+
+
+def whole_number(column):
+    """Rule for a count such as Reviews: digits only."""
+    def test(value):
+        if not value.isdigit():
+            return '{}: {!r} is not a whole number'.format(column, value)
+
+    return Rule(column, test, cached=False, all_good=_all_digits)
+
+
+def number(column, parser=float, low=None, high=None, missing=()):
+    """Rule for a value ``parser`` turns into a number within
+    ``[low, high]``; the strings in ``missing`` (such as 'NaN') pass."""
+    def test(value):
+        if value in missing:
+            return None
+        try:
+            parsed = parser(value)
+        except ValueError:
+            return '{}: {!r} is not a number'.format(column, value)
+        if parsed != parsed:
+            return '{}: {!r} is not a number'.format(column, value)
+        if ((low is not None and parsed < low)
+                or (high is not None and parsed > high)):
+            return '{}: {!r} is outside [{}, {}]'.format(column, value,
+                                                         low, high)
+
+    return Rule(column, test)
+
+
+def android_rules():
+    """Rules for the Google Play columns the analysis reads."""
+    return [number('Rating', low=0, high=5, missing=('NaN',)),
+            whole_number('Reviews'),
+            number('Installs', parse_installs, low=0),
+            number('Price', parse_price, low=0)]
+
+
+def ios_rules():
+    """Rules for the App Store columns the analysis reads."""
+    return [number('price', low=0),
+            whole_number('rating_count_tot'),
+            number('user_rating', low=0, high=5)]
+
+
+class Quarantine:
+    """Csv file of rejected rows: row number, reason, then the raw fields.
+
+    Row numbers count data rows from 0, so they match ``android[10472]``.
+    """
+
+    def __init__(self, path, encoding='utf8'):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding=encoding, newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['row', 'reason'])
+
+    def write(self, row_id, reason, row):
+        self._writer.writerow([row_id, reason] + list(row))
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _failures(batch, n_columns, rules):
+    """Return ``{offset: reasons}`` for the rows of a batch that fail."""
+    if set(map(len, batch)) == {n_columns}:
+        checked = None
+        rows = batch
+        failures = {}
+    else:
+        checked = []
+        failures = {}
+        for offset, row in enumerate(batch):
+            if len(row) == n_columns:
+                checked.append(offset)
+            else:
+                failures[offset] = ['expected {} fields, got {}'.format(
+                    n_columns, len(row))]
+        rows = [batch[offset] for offset in checked]
+
+    for getter, rule in rules:
+        if rule.passes(map(getter, rows)):
+            continue
+        for offset, reason in rule.failures(
+                list(map(getter, rows))).items():
+            if checked is not None:
+                offset = checked[offset]
+            failures.setdefault(offset, []).append(reason)
+    return {offset: '; '.join(reasons)
+            for offset, reasons in failures.items()}
+
+
+@instrumented('validate')
+def validate_rows(rows, header, rules, bad_rows=None, quarantine=None,
+                  batch_size=256):
+    """Yield the rows that have one field per column of ``header`` and
+    pass every rule, skipping the others.
+
+    Skipped rows are appended to ``bad_rows`` when a list is given, and
+    written with their reason to ``quarantine``, a ``Quarantine`` or the
+    path of the csv file to create.
+    """
+    positions = {name: position for position, name in enumerate(header)}
+    missing = [rule.column for rule in rules if rule.column not in positions]
+    if missing:
+        raise ValueError('Header has no column {}'.format(
+            ', '.join(map(repr, missing))))
+    rules = [(itemgetter(positions[rule.column]), rule) for rule in rules]
+    n_columns = len(header)
+
+    owned = isinstance(quarantine, str)
+    if owned:
+        quarantine = Quarantine(quarantine)
+    try:
+        rows = iter(rows)
+        start = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            failures = _failures(batch, n_columns, rules)
+            if not failures:
+                yield from batch
+            else:
+                for offset, row in enumerate(batch):
+                    reason = failures.get(offset)
+                    if reason is None:
+                        yield row
+                        continue
+                    if bad_rows is not None:
+                        bad_rows.append(row)
+                    if quarantine is not None:
+                        quarantine.write(start + offset, reason, row)
+            start += len(batch)
+    finally:
+        if owned:
+            quarantine.close()
+
+
+def validate_tagged(tagged, header, rules, bad_rows=None):
+    """Run ``validate_rows`` over ``(tag, row)`` pairs, keeping the tags."""
+    pending = deque()
+
+    def rows():
+        for tag, row in tagged:
+            pending.append((tag, row))
+            yield row
+
+    for row in validate_rows(rows(), header, rules, bad_rows):
+        # validate_rows yields the rows it keeps unchanged and in order,
+        # so the rejected ones are the pending rows before this one.
+        tag, pending_row = pending.popleft()
+        while pending_row is not row:
+            tag, pending_row = pending.popleft()
+        yield tag, row
@@ -0,0 +1,57 @@
+"""Micro-benchmark of is_english_batch against the per-character loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_is_english [n_names]
+"""
+
+import random
+import sys
+import timeit
+
+from app_profiles import is_english_batch
+
+SAMPLES = [
+    'Instagram',
+    'Docs To Go™ Free Office Suite',
+    'Instachat 😜',
+    '爱奇艺PPS -《欢乐颂2》电视剧热播',
+    'Photo Editor & Candy Camera & Grid & ScrapBook',
+    'Coloring book moana',
+    'Pixel Draw - Number Art Coloring Book',
+    'U Launcher Lite – FREE Live Cool Themes, Hide Apps',
+]
+
+
+def is_english_per_character(string):
+    non_ascii = 0
+    for character in string:
+        if ord(character) > 127:
+            non_ascii += 1
+
+    if non_ascii > 3:
+        return False
+    else:
+        return True
+
+
+def main(n_names=100000):
+    random.seed(0)
+    names = [random.choice(SAMPLES) + ' ' + str(i) for i in range(n_names)]
+
+    expected = [is_english_per_character(name) for name in names]
+    assert is_english_batch(names) == expected
+
+    loop = min(timeit.repeat(
+        lambda: [is_english_per_character(name) for name in names],
+        number=1, repeat=5))
+    batch = min(timeit.repeat(lambda: is_english_batch(names),
+                              number=1, repeat=5))
+    print('names:', n_names)
+    print('per-character loop: {:.4f}s'.format(loop))
+    print('is_english_batch:   {:.4f}s'.format(batch))
+    print('speed-up: {:.1f}x'.format(loop / batch))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
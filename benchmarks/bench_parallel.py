@@ -0,0 +1,65 @@
+"""Measure how profile_parallel scales with the number of workers.
+
+    python -m benchmarks.bench_parallel [n_rows] [max_workers]
+
+The serial ``clean_android`` / ``clean_ios`` plus a frequency count is the
+baseline. ``profile_parallel`` is timed for 1, 2, 4, ... up to
+``max_workers`` workers (default: the number of CPUs), with the kept rows
+rebuilt in the parent and with the counts only. The speedup is relative
+to the serial time.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from app_profiles import clean_android, clean_ios, profile_parallel
+from benchmarks.synthetic import write_android, write_ios
+
+COLUMNS = {'android': (1, 9), 'ios': (11,)}
+
+
+def serial(path, store):
+    clean = clean_android if store == 'android' else clean_ios
+    _, rows = clean(path)
+    rows = list(rows)
+    return {column: Counter(row[column] for row in rows)
+            for column in COLUMNS[store]}
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(n_rows=400000, max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for store, write in (('android', write_android), ('ios', write_ios)):
+            path = os.path.join(directory, store + '.csv')
+            write(path, n_rows)
+            baseline = timed(serial, path, store)
+            print('{} ({} rows, {} CPUs)'.format(store, n_rows,
+                                                 os.cpu_count()))
+            print('  serial:             {:.3f}s'.format(baseline))
+            for workers in counts:
+                for keep_rows in (True, False):
+                    elapsed = timed(profile_parallel, path, store,
+                                    COLUMNS[store], workers,
+                                    keep_rows=keep_rows)
+                    print('  {:2d} workers, {:9s} {:.3f}s {:5.2f}x'.format(
+                        workers, 'rows:' if keep_rows else 'counts:',
+                        elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,143 @@
+"""Time every stage of the analysis on synthetic store data.
+
+    python -m benchmarks.bench_pipeline --sizes 10000 100000 1000000 \
+        --output results.json
+
+For every size a Google Play and an App Store file are generated, then
+each stage is timed in turn: load, dedup, language filter, price filter,
+building the AppTable, freq_table and the per-group averages. Peak RSS is
+the process high-water mark after the stage, so it only grows within a
+run; run sizes separately to compare their peaks. Results are written as
+JSON so runs can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from app_profiles import (
+    ANDROID_SCHEMA,
+    IOS_SCHEMA,
+    AppTable,
+    deduplicate,
+    drop_malformed,
+    freq_table,
+    group_aggregate,
+    keep_english,
+    keep_free,
+    split_header,
+    stream_rows,
+)
+from benchmarks.synthetic import write_android, write_ios
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+
+    def run(self, name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        rows = result[-1] if isinstance(result, tuple) else result
+        self.stages.append({
+            'stage': name,
+            'seconds': elapsed,
+            'rows_out': len(rows) if hasattr(rows, '__len__') else None,
+            'peak_rss_mb': peak_rss_mb(),
+        })
+        return result
+
+
+def load(path):
+    header, rows = split_header(stream_rows(path))
+    return header, list(drop_malformed(rows, len(header)))
+
+
+def bench_android(path, timer):
+    header, rows = timer.run('load', load, path)
+    rows = timer.run('dedup', lambda: deduplicate(rows, 0, keep_by=3)[0])
+    rows = timer.run('language filter', lambda: list(keep_english(rows, 0)))
+    rows = timer.run('price filter', lambda: list(keep_free(rows, 7, '0')))
+    table = timer.run('table', AppTable.from_rows, header, rows,
+                      ANDROID_SCHEMA)
+    timer.run('freq_table', freq_table, table, 'Category')
+    timer.run('group averages', group_aggregate, table, 'Category',
+              'n_installs')
+
+
+def bench_ios(path, timer):
+    header, rows = timer.run('load', load, path)
+    rows = timer.run('language filter', lambda: list(keep_english(rows, 1)))
+    rows = timer.run('price filter', lambda: list(keep_free(rows, 4, '0.0')))
+    table = timer.run('table', AppTable.from_rows, header, rows, IOS_SCHEMA)
+    timer.run('freq_table', freq_table, table, 'prime_genre')
+    timer.run('group averages', group_aggregate, table, 'prime_genre',
+              'rating_count_tot')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--non-ascii-rate', type=float, default=0.05)
+    parser.add_argument('--malformed-rate', type=float, default=0.0001)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark-{}.json'.format(
+        datetime.now().strftime('%Y%m%d-%H%M%S')))
+    args = parser.parse_args(argv)
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'duplicate_rate': args.duplicate_rate,
+            'non_ascii_rate': args.non_ascii_rate,
+            'malformed_rate': args.malformed_rate,
+            'seed': args.seed,
+        },
+        'runs': [],
+    }
+    rates = (args.duplicate_rate, args.non_ascii_rate, args.malformed_rate,
+             args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for store, write, bench in (('android', write_android,
+                                         bench_android),
+                                        ('ios', write_ios, bench_ios)):
+                path = os.path.join(directory, '{}-{}.csv'.format(store, size))
+                write(path, size, *rates)
+                timer = StageTimer()
+                bench(path, timer)
+                os.remove(path)
+                results['runs'].append({'store': store, 'rows': size,
+                                        'stages': timer.stages})
+                total = sum(stage['seconds'] for stage in timer.stages)
+                print('{:>8} {:>10} rows: {:.3f}s'.format(store, size, total))
+
+    with open(args.output, 'w', encoding='utf8') as opened_file:
+        json.dump(results, opened_file, indent=2)
+    print('results written to', args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compare scan_csv with stream_rows on synthetic store files.
+
+    python -m benchmarks.bench_scan [n_rows]
+
+Both readers are drained into a list, as the notebook does, and timed;
+the memory held by that list is measured with tracemalloc.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app_profiles import (
+    ANDROID_COLUMNS,
+    IOS_COLUMNS,
+    scan_csv,
+    split_header,
+    stream_rows,
+)
+from benchmarks.synthetic import write_android, write_ios
+
+
+def measure(read):
+    gc.collect()
+    start = time.perf_counter()
+    rows = read()
+    elapsed = time.perf_counter() - start
+    del rows
+    gc.collect()
+    tracemalloc.start()
+    rows = read()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, held / 2 ** 20
+
+
+def main(n_rows=200000):
+    with tempfile.TemporaryDirectory() as directory:
+        for store, write, columns in (('android', write_android,
+                                       ANDROID_COLUMNS),
+                                      ('ios', write_ios, IOS_COLUMNS)):
+            path = os.path.join(directory, store + '.csv')
+            write(path, n_rows)
+            full = measure(lambda: list(split_header(stream_rows(path))[1]))
+            scan = measure(lambda: list(scan_csv(path, columns)[1]))
+            print('{} ({} rows, {} of the columns)'.format(
+                store, n_rows, len(columns)))
+            print('  stream_rows: {:.3f}s {:.1f} MB'.format(*full))
+            print('  scan_csv:    {:.3f}s {:.1f} MB'.format(*scan))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,115 @@
+"""Synthetic Google Play and App Store csv files for benchmarking.
+
+The files use the real headers and plausible values, with configurable
+shares of duplicate apps, non-English names and malformed rows (rows
+missing the Category column, like android[10472]).
+"""
+
+import csv
+import random
+
+ANDROID_HEADER = ['App', 'Category', 'Rating', 'Reviews', 'Size', 'Installs',
+                  'Type', 'Price', 'Content Rating', 'Genres', 'Last Updated',
+                  'Current Ver', 'Android Ver']
+IOS_HEADER = ['id', 'track_name', 'size_bytes', 'currency', 'price',
+              'rating_count_tot', 'rating_count_ver', 'user_rating',
+              'user_rating_ver', 'ver', 'cont_rating', 'prime_genre',
+              'sup_devices.num', 'ipadSc_urls.num', 'lang.num', 'vpp_lic']
+
+CATEGORIES = ['FAMILY', 'GAME', 'TOOLS', 'BUSINESS', 'LIFESTYLE',
+              'PRODUCTIVITY', 'FINANCE', 'MEDICAL', 'SPORTS', 'PERSONALIZATION',
+              'COMMUNICATION', 'HEALTH_AND_FITNESS', 'PHOTOGRAPHY',
+              'NEWS_AND_MAGAZINES', 'SOCIAL', 'TRAVEL_AND_LOCAL', 'SHOPPING',
+              'BOOKS_AND_REFERENCE', 'DATING', 'VIDEO_PLAYERS', 'MAPS_AND_NAVIGATION',
+              'EDUCATION', 'FOOD_AND_DRINK', 'ENTERTAINMENT', 'AUTO_AND_VEHICLES',
+              'LIBRARIES_AND_DEMO', 'HOUSE_AND_HOME', 'WEATHER', 'EVENTS',
+              'ART_AND_DESIGN', 'PARENTING', 'COMICS', 'BEAUTY']
+GENRES = ['Tools', 'Entertainment', 'Education', 'Business', 'Productivity',
+          'Lifestyle', 'Finance', 'Medical', 'Sports', 'Personalization',
+          'Communication', 'Action', 'Health & Fitness', 'Photography',
+          'News & Magazines', 'Social', 'Casual', 'Arcade', 'Puzzle',
+          'Art & Design;Pretend Play', 'Education;Brain Games',
+          'Casual;Action & Adventure', 'Educational;Education', 'Beauty']
+INSTALLS = ['0+', '1+', '5+', '10+', '50+', '100+', '500+', '1,000+',
+            '5,000+', '10,000+', '50,000+', '100,000+', '500,000+',
+            '1,000,000+', '5,000,000+', '10,000,000+', '50,000,000+',
+            '100,000,000+', '500,000,000+', '1,000,000,000+']
+INSTALL_WEIGHTS = [1, 1, 2, 5, 4, 8, 6, 10, 7, 11, 7, 11, 5, 15, 6, 10, 3,
+                   4, 1, 1]
+PRIME_GENRES = ['Games', 'Entertainment', 'Education', 'Photo & Video',
+                'Utilities', 'Health & Fitness', 'Productivity',
+                'Social Networking', 'Lifestyle', 'Music', 'Shopping',
+                'Sports', 'Book', 'Finance', 'Travel', 'News', 'Weather',
+                'Reference', 'Food & Drink', 'Business', 'Navigation',
+                'Medical', 'Catalogs']
+WORDS = ['Photo', 'Editor', 'Free', 'Pro', 'Music', 'Player', 'Puzzle',
+         'Coloring', 'Book', 'Launcher', 'Weather', 'Cleaner', 'Chat',
+         'Video', 'Maps', 'Fitness', 'Diary', 'Keyboard', 'Scanner', 'Lite']
+NON_ENGLISH = ['爱奇艺', '欢乐颂', '电视剧热播', 'Фото', 'ニュース', '카메라']
+SYMBOLS = ['™', '😜', '–', '—']
+
+
+def _name(rng, number, non_ascii_rate):
+    name = '{} {} {}'.format(rng.choice(WORDS), rng.choice(WORDS), number)
+    if rng.random() < non_ascii_rate:
+        return rng.choice(NON_ENGLISH) + ' ' + name
+    if rng.random() < 0.05:
+        return name + ' ' + rng.choice(SYMBOLS)
+    return name
+
+
+def _names(rng, n_rows, duplicate_rate, non_ascii_rate):
+    seen = []
+    for number in range(n_rows):
+        if seen and rng.random() < duplicate_rate:
+            yield rng.choice(seen)
+        else:
+            name = _name(rng, number, non_ascii_rate)
+            if len(seen) < 100000:
+                seen.append(name)
+            else:
+                seen[rng.randrange(len(seen))] = name
+            yield name
+
+
+def write_android(path, n_rows, duplicate_rate=0.1, non_ascii_rate=0.01,
+                  malformed_rate=0.0001, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf8', newline='') as opened_file:
+        writer = csv.writer(opened_file)
+        writer.writerow(ANDROID_HEADER)
+        for name in _names(rng, n_rows, duplicate_rate, non_ascii_rate):
+            price = '0' if rng.random() < 0.92 else rng.choice(
+                ['$0.99', '$1.99', '$2.99', '$4.99'])
+            row = [name, rng.choice(CATEGORIES),
+                   str(round(rng.uniform(1, 5), 1)),
+                   str(int(rng.paretovariate(0.6))), '{}M'.format(
+                       rng.randint(1, 99)),
+                   rng.choices(INSTALLS, INSTALL_WEIGHTS)[0],
+                   'Free' if price == '0' else 'Paid', price, 'Everyone',
+                   rng.choice(GENRES), 'January 7, 2018', '1.0.0',
+                   '4.0.3 and up']
+            if rng.random() < malformed_rate:
+                del row[1]
+                row[3] = '3.0M'
+            writer.writerow(row)
+
+
+def write_ios(path, n_rows, duplicate_rate=0.0, non_ascii_rate=0.15,
+              malformed_rate=0.0001, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf8', newline='') as opened_file:
+        writer = csv.writer(opened_file)
+        writer.writerow(IOS_HEADER)
+        names = _names(rng, n_rows, duplicate_rate, non_ascii_rate)
+        for number, name in enumerate(names):
+            price = '0.0' if rng.random() < 0.55 else rng.choice(
+                ['0.99', '1.99', '2.99', '4.99'])
+            row = [str(number + 281656475), name,
+                   str(rng.randint(1000000, 500000000)), 'USD', price,
+                   str(int(rng.paretovariate(0.5))), str(rng.randint(0, 500)),
+                   str(rng.randint(0, 10) / 2), str(rng.randint(0, 10) / 2),
+                   '1.0', '4+', rng.choice(PRIME_GENRES), '38', '5', '1', '1']
+            if rng.random() < malformed_rate:
+                del row[3]
+            writer.writerow(row)
@@ -0,0 +1,117 @@
+"""Small store files shared by the tests.
+
+Synthetic files from ``benchmarks.synthetic`` get a few rows the
+validation rejects, spread over the file so that they land in different
+batches, byte-range chunks and delta files. ``notebook_android`` and
+``notebook_ios`` are the plain loops of the original notebook, the
+reference the faster paths are compared with.
+"""
+
+import csv
+
+import pytest
+
+from app_profiles import clean_android, clean_ios
+from benchmarks.synthetic import write_android, write_ios
+
+BAD_ANDROID = [
+    ['Bad Reviews', 'GAME', '4.1', '3.0M', '1M', '1,000+', 'Free', '0',
+     'Everyone', 'Arcade', 'January 7, 2018', '1.0.0', '4.0.3 and up'],
+    ['Bad Rating', 'GAME', '19', '30', '1M', '1,000+', 'Free', '0',
+     'Everyone', 'Arcade', 'January 7, 2018', '1.0.0', '4.0.3 and up'],
+    # android[10472]: the Category is missing
+    ['Life Made WI-Fi Touchscreen Photo Frame', '1.9', '19', '3.0M',
+     '1,000+', 'Free', '0', 'Everyone', '', 'February 11, 2018', '1.0.19',
+     '4.0 and up'],
+]
+BAD_IOS = [
+    ['1', 'Bad Price', '100', 'USD', 'free', '10', '1', '4.0', '4.0', '1.0',
+     '4+', 'Games', '38', '5', '1', '1'],
+    ['2', 'Bad Count', '100', 'USD', '0.0', '1e3', '1', '4.0', '4.0', '1.0',
+     '4+', 'Games', '38', '5', '1', '1'],
+    ['3', 'Too Short', '100', '0.0', '10'],
+]
+
+
+def read_csv(path):
+    with open(path, encoding='utf8', newline='') as opened_file:
+        return list(csv.reader(opened_file))
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf8', newline='') as opened_file:
+        csv.writer(opened_file).writerows(rows)
+    return str(path)
+
+
+def split_csv(path, directory, n_parts):
+    """Split the rows of ``path`` into ``n_parts`` files that each start
+    with the header."""
+    header, *rows = read_csv(path)
+    size = -(-len(rows) // n_parts)
+    return [write_csv(directory / 'part{}.csv'.format(part),
+                      [header] + rows[part * size:(part + 1) * size])
+            for part in range(n_parts)]
+
+
+def _with_bad_rows(path, bad_rows):
+    rows = read_csv(path)
+    step = len(rows) // (len(bad_rows) + 1)
+    for number, row in enumerate(bad_rows, 1):
+        rows.insert(number * step, row)
+    return write_csv(path, rows)
+
+
+@pytest.fixture(scope='session')
+def android_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'googleplaystore.csv'
+    write_android(str(path), 3000, duplicate_rate=0.2, non_ascii_rate=0.05,
+                  malformed_rate=0, seed=1)
+    return _with_bad_rows(path, BAD_ANDROID)
+
+
+@pytest.fixture(scope='session')
+def ios_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'AppleStore.csv'
+    write_ios(str(path), 2000, malformed_rate=0, seed=1)
+    return _with_bad_rows(path, BAD_IOS)
+
+
+@pytest.fixture(scope='session')
+def android_serial(android_csv):
+    header, rows = clean_android(android_csv)
+    return header, list(rows)
+
+
+@pytest.fixture(scope='session')
+def ios_serial(ios_csv):
+    header, rows = clean_ios(ios_csv)
+    return header, list(rows)
+
+
+def notebook_english(name):
+    return sum(ord(character) > 127 for character in name) <= 3
+
+
+def notebook_android(rows):
+    """The notebook's reviews_max / already_added loops and filters."""
+    reviews_max = {}
+    for app in rows:
+        name = app[0]
+        n_reviews = float(app[3])
+        if name not in reviews_max or reviews_max[name] < n_reviews:
+            reviews_max[name] = n_reviews
+    android_clean = []
+    already_added = []
+    for app in rows:
+        name = app[0]
+        if reviews_max[name] == float(app[3]) and name not in already_added:
+            android_clean.append(app)
+            already_added.append(name)
+    return [app for app in android_clean
+            if notebook_english(app[0]) and app[7] == '0']
+
+
+def notebook_ios(rows):
+    return [app for app in rows
+            if notebook_english(app[1]) and app[4] == '0.0']
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from app_profiles import cache, freq_table, group_aggregate
+from app_profiles.analysis import load_android, load_ios
+
+
+@pytest.mark.parametrize('store, load, columns, value', [
+    ('android', load_android, ('Category', 'Genres'), 'n_installs'),
+    ('ios', load_ios, ('prime_genre',), 'rating_count_tot'),
+])
+def test_cached_table_matches_fresh_one(store, load, columns, value,
+                                        request, tmp_path):
+    path = request.getfixturevalue(store + '_csv')
+    fresh = load(path)
+    cache_dir = str(tmp_path / 'cache')
+    cold = load(path, cache_dir=cache_dir)
+    warm = load(path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2  # index.json and one entry
+    for table in (cold, warm):
+        assert list(table) == list(fresh)
+        for column in columns:
+            assert freq_table(table, column) == freq_table(fresh, column)
+            assert group_aggregate(table, column, value) == (
+                group_aggregate(fresh, column, value))
+
+
+def test_new_cache_version_replaces_entries(android_csv, tmp_path,
+                                            monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    load_android(android_csv, cache_dir=cache_dir)
+    old_entries = set(os.listdir(cache_dir))
+    monkeypatch.setattr(cache, 'CACHE_VERSION', cache.CACHE_VERSION + 1)
+    table = load_android(android_csv, cache_dir=cache_dir)
+    entries = set(os.listdir(cache_dir))
+    assert len(entries) == 2
+    assert entries & old_entries == {'index.json'}
+    assert list(table) == list(load_android(android_csv))
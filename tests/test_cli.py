@@ -0,0 +1,57 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app_profiles import freq_table
+from app_profiles.cli import main
+
+
+def run(*argv):
+    out = io.StringIO()
+    assert main(['analyze'] + list(argv), out) == 0
+    return out.getvalue()
+
+
+def test_json_output(android_csv, ios_csv, android_serial, ios_serial):
+    results = json.loads(run('--android', android_csv, '--ios', ios_csv,
+                             '--format', 'json', '--top', '3'))
+    assert results['android']['apps'] == len(android_serial[1])
+    assert results['ios']['apps'] == len(ios_serial[1])
+    genres = freq_table(ios_serial[1], 11)
+    largest = sorted(((share, genre) for genre, share in genres.items()),
+                     reverse=True)[:3]
+    assert list(results['ios']['prime_genre'].items()) == [
+        (genre, share) for share, genre in largest]
+
+
+def test_text_and_markdown_output(ios_csv, ios_serial):
+    n_apps = len(ios_serial[1])
+    text = run('--ios', ios_csv, '--ios-drill-down', 'Games')
+    assert text.startswith('ios apps: {}\n'.format(n_apps))
+    assert '\nios ratings_in_Games\n' in text
+    markdown = run('--ios', ios_csv, '--format', 'markdown')
+    assert markdown.startswith('**ios apps:** {}\n'.format(n_apps))
+    assert '## ios prime_genre\n\n| prime_genre | value |\n' in markdown
+
+
+def test_csv_output(android_csv, tmp_path):
+    directory = str(tmp_path / 'report')
+    run('--android', android_csv, '--format', 'csv', '--output', directory)
+    assert 'android_category.csv' in os.listdir(directory)
+    with pytest.raises(SystemExit):
+        run('--android', android_csv, '--format', 'csv')
+    with pytest.raises(SystemExit):
+        run('--format', 'json')
+
+
+def test_module_entry_point(ios_csv, tmp_path):
+    output = tmp_path / 'report.json'
+    subprocess.run([sys.executable, '-m', 'app_profiles', 'analyze',
+                    '--ios', ios_csv, '--format', 'json',
+                    '--output', str(output)], check=True,
+                   cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert 'ios' in json.loads(output.read_text())
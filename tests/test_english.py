@@ -0,0 +1,29 @@
+import random
+
+from app_profiles import is_english, is_english_batch
+from app_profiles.english import non_ascii_count
+from conftest import notebook_english
+
+NAMES = ['Instagram', '爱奇艺PPS -《欢乐颂2》电视剧热播',
+         'Docs To Go™ Free Office Suite', 'Instachat 😜',
+         'Flashlight ✨ 🔦 😎', 'Ünïcödé', '', '€€€€']
+
+
+def test_batch_matches_per_character_rule():
+    generator = random.Random(5)
+    alphabet = 'abc XYZ 09-' + 'éü™—😜爱'
+    names = NAMES + [''.join(generator.choice(alphabet)
+                             for _ in range(generator.randrange(12)))
+                     for _ in range(500)]
+    for max_non_ascii in (0, 1, 3):
+        expected = [sum(ord(character) > 127 for character in name)
+                    <= max_non_ascii for name in names]
+        assert is_english_batch(names, max_non_ascii) == expected
+        assert [is_english(name, max_non_ascii)
+                for name in names] == expected
+    assert is_english_batch(names) == list(map(notebook_english, names))
+
+
+def test_non_ascii_count():
+    assert non_ascii_count('Instagram') == 0
+    assert non_ascii_count('Flashlight ✨ 🔦 😎') == 3
@@ -0,0 +1,51 @@
+import pytest
+
+from app_profiles import ANDROID_SCHEMA, AppTable, GenreIndex, parse_installs
+
+
+def test_counts_match_split_strings(android_serial):
+    header, rows = android_serial
+    expected = {}
+    for row in rows:
+        for genre in row[9].split(';'):
+            expected[genre] = expected.get(genre, 0) + 1
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    assert GenreIndex(table).counts() == expected
+    assert GenreIndex(rows, header=header).counts() == expected
+    assert GenreIndex(rows, 9).counts() == expected
+
+
+def test_aggregate_on_rows_and_table(android_serial):
+    header, rows = android_serial
+    totals = {}
+    for row in rows:
+        for genre in row[9].split(';'):
+            total = totals.setdefault(genre, [0, 0.0])
+            total[0] += 1
+            total[1] += parse_installs(row[5])
+    expected = {genre: {'count': count, 'sum': total, 'mean': total / count}
+                for genre, (count, total) in totals.items()}
+
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    index = GenreIndex(rows, header=header)
+    for aggregates in (GenreIndex(table).aggregate('n_installs'),
+                       index.aggregate('Installs'), index.aggregate(5),
+                       index.aggregate(lambda row: parse_installs(row[5]))):
+        assert list(aggregates) == list(expected)
+        for genre, result in aggregates.items():
+            assert result == pytest.approx(expected[genre])
+
+
+def test_ids_and_pairs():
+    rows = [['a', 'Puzzle'], ['b', 'Art & Design;Pretend Play'],
+            ['c', 'Puzzle;Pretend Play']]
+    index = GenreIndex(rows, 1)
+    assert index.ids('Pretend Play') == [1, 2]
+    assert index.ids('Arcade') == []
+    assert index.pairs() == {('Puzzle', 'Pretend Play'): 1,
+                             ('Art & Design', 'Pretend Play'): 1}
+
+
+def test_named_column_of_rows_needs_header():
+    with pytest.raises(TypeError):
+        GenreIndex([['a', 'Puzzle']])
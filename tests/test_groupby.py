@@ -0,0 +1,56 @@
+import json
+from statistics import median
+
+from app_profiles import (
+    ANDROID_SCHEMA,
+    AppTable,
+    freq_table,
+    group_aggregate,
+    group_quantiles,
+    parse_installs,
+    popularity,
+)
+
+
+def test_matches_per_group_loops(android_serial):
+    header, rows = android_serial
+    installs = lambda row: parse_installs(row[5])
+    values = {}
+    for row in rows:
+        values.setdefault(row[1], []).append(installs(row))
+    expected = {category: {'count': len(group), 'sum': sum(group),
+                           'mean': sum(group) / len(group),
+                           'median': median(group)}
+                for category, group in values.items()}
+    assert group_aggregate(rows, 1, installs) == expected
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    assert group_aggregate(table, 'Category', 'n_installs') == expected
+
+
+def test_unparsed_values_are_skipped():
+    rows = [['X', '10'], ['X', 'n/a'], ['X', '30'], ['Y', 'n/a']]
+    table = AppTable.from_rows(['key', 'value'], rows,
+                               {'numeric': {'value': (float, 'd')}})
+    groups = group_aggregate(table, 'key', 'value')
+    assert groups == {'X': {'count': 2, 'sum': 40.0, 'mean': 20.0,
+                            'median': 20.0}}
+    json.dumps(groups, allow_nan=False)
+
+
+def test_unparsed_integers_are_not_zeros():
+    rows = [['X', '10'], ['X', 'n/a'], ['X', '30']]
+    table = AppTable.from_rows(['key', 'value'], rows,
+                               {'numeric': {'value': (int, 'q')}})
+    assert group_aggregate(table, 'key', 'value', aggs=('count', 'mean')) == {
+        'X': {'count': 2, 'mean': 20.0}}
+    assert popularity(table, 'key', 'value')['X']['median'] == 20
+    assert group_quantiles(table, 'key', 'value', fractions=(0.5,)) == {
+        'X': {0.5: 10}}
+    assert list(freq_table(table, 'value')) == [10, 'n/a', 30]
+
+
+def test_value_fn_none_leaves_rows_out():
+    rows = [['X', '10'], ['X', '300'], ['Y', '5']]
+    under_100 = lambda row: float(row[1]) if float(row[1]) < 100 else None
+    assert group_aggregate(rows, 0, under_100, aggs=('count', 'mean')) == {
+        'X': {'count': 1, 'mean': 10.0}, 'Y': {'count': 1, 'mean': 5.0}}
@@ -0,0 +1,73 @@
+import pytest
+
+from app_profiles import IncrementalProfile, freq_table, group_aggregate
+from app_profiles.parse import parse_installs
+from conftest import split_csv
+
+GROUPS = {'android': ((1, 5), (9, 3)), 'ios': ((11, 5),)}
+COLUMNS = {'android': (1, 9), 'ios': (11,)}
+
+
+def profile(store):
+    return IncrementalProfile(store, COLUMNS[store], GROUPS[store])
+
+
+def assert_matches(store, incremental, rows):
+    assert incremental.rows() == rows
+    for column in COLUMNS[store]:
+        assert incremental.freq_table(column) == pytest.approx(
+            freq_table(rows, column))
+    for key_col, value_col in GROUPS[store]:
+        expected = group_aggregate(
+            rows, key_col, lambda row: parse_installs(row[value_col]),
+            aggs=('mean',))
+        assert incremental.group_means(key_col, value_col) == pytest.approx(
+            {key: group['mean'] for key, group in expected.items()})
+
+
+@pytest.mark.parametrize('store', ['android', 'ios'])
+def test_full_file_matches_serial(store, request):
+    path = request.getfixturevalue(store + '_csv')
+    _, rows = request.getfixturevalue(store + '_serial')
+    incremental = profile(store)
+    incremental.apply_csv(path)
+    assert_matches(store, incremental, rows)
+
+
+@pytest.mark.parametrize('store', ['android', 'ios'])
+def test_deltas_match_serial(store, request, tmp_path):
+    path = request.getfixturevalue(store + '_csv')
+    _, rows = request.getfixturevalue(store + '_serial')
+    incremental = profile(store)
+    for part in split_csv(path, tmp_path, 4):
+        incremental.apply_csv(part)
+    assert_matches(store, incremental, rows)
+
+
+@pytest.mark.parametrize('store', ['android', 'ios'])
+def test_reapplying_a_file_changes_nothing(store, request, tmp_path):
+    path = request.getfixturevalue(store + '_csv')
+    _, rows = request.getfixturevalue(store + '_serial')
+    incremental = profile(store)
+    incremental.apply_csv(path)
+    incremental.apply_csv(path)
+    assert_matches(store, incremental, rows)
+
+    saved = tmp_path / 'profile.pickle'
+    incremental.save(str(saved))
+    assert_matches(store, IncrementalProfile.load(str(saved)), rows)
+
+
+def test_replaced_entry_is_subtracted():
+    incremental = IncrementalProfile('ios', columns=(11,), groups=((11, 5),))
+    row = ['1', 'App', '1', 'USD', '0.0', '10', '1', '4.0', '4.0', '1.0',
+           '4+', 'Games', '38', '5', '1', '1']
+    incremental.apply_rows([row])
+    incremental.apply_rows([row[:5] + ['30'] + row[6:11] + ['Music']
+                            + row[12:]])
+    assert incremental.freq_table(11) == {'Music': 100.0}
+    assert incremental.group_means(11, 5) == {'Music': 30.0}
+
+    # an entry with fewer ratings doesn't replace the kept one
+    incremental.apply_rows([row])
+    assert [app[11] for app in incremental.rows()] == ['Music']
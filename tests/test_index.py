@@ -0,0 +1,35 @@
+import pytest
+
+from app_profiles import ANDROID_SCHEMA, AppIndex, AppTable
+
+
+@pytest.mark.parametrize('as_table', [False, True])
+def test_select_matches_a_scan(android_serial, as_table):
+    header, rows = android_serial
+    dataset = rows
+    if as_table:
+        dataset = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    index = AppIndex(dataset, [1, 5, 6])
+    category = rows[0][1]
+    tiers = sorted({row[5] for row in rows})[:3]
+
+    assert index.select({1: category}) == [
+        row_id for row_id, row in enumerate(rows) if row[1] == category]
+    expected = [row_id for row_id, row in enumerate(rows)
+                if row[1] == category and row[5] in tiers]
+    assert index.select({1: category, 5: tiers}) == expected
+    assert index.select({5: set(tiers), 1: [category]}) == expected
+    assert index.rows({1: category, 5: tiers}) == [rows[row_id]
+                                                    for row_id in expected]
+    assert index.select({1: 'NO SUCH CATEGORY', 5: tiers}) == []
+    assert index.select({}) == list(range(len(rows)))
+
+
+def test_table_columns_by_name(android_serial):
+    header, rows = android_serial
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    index = AppIndex(table, ['Category', 'Reviews'])
+    reviews = int(rows[3][3])
+    assert index.select({1: rows[3][1], 'Reviews': reviews}) == [
+        row_id for row_id, row in enumerate(rows)
+        if row[1] == rows[3][1] and int(row[3]) == reviews]
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app_profiles import load_many, read_concurrently
+from conftest import BAD_ANDROID, BAD_IOS, read_csv, split_csv
+
+
+@pytest.mark.parametrize('store, bad', [('android', BAD_ANDROID),
+                                        ('ios', BAD_IOS)])
+def test_load_many_matches_serial(store, bad, request, tmp_path):
+    path = request.getfixturevalue(store + '_csv')
+    header, rows = request.getfixturevalue(store + '_serial')
+    # small queue and batches, so the readers have to wait on each other
+    bad_rows = []
+    many_header, many_rows = load_many(split_csv(path, tmp_path, 5), store,
+                                       max_workers=3, queue_size=2,
+                                       bad_rows=bad_rows)
+    assert many_header == header
+    assert list(many_rows) == rows
+    # files are interleaved, so only the rejected rows' order may differ
+    assert sorted(bad_rows) == sorted(bad)
+
+
+def test_load_many_keeps_most_rated_ios_entry(ios_csv, tmp_path):
+    header, *rows = read_csv(ios_csv)
+    first = tmp_path / 'us.csv'
+    second = tmp_path / 'gb.csv'
+    app = next(row for row in rows if row[4] == '0.0' and row[1].isascii())
+    more_rated = app[:5] + [str(int(app[5]) + 1)] + app[6:]
+    for path, region_rows in [(first, [header, app]),
+                              (second, [header, more_rated, app])]:
+        path.write_text('\n'.join(','.join(row) for row in region_rows))
+    _, kept = load_many([str(first), str(second)], 'ios')
+    assert list(kept) == [more_rated]
+
+
+def test_read_concurrently_tags_rows(android_csv, tmp_path):
+    paths = split_csv(android_csv, tmp_path, 3)
+    _, tagged = read_concurrently(paths, max_workers=2, batch_size=7)
+    by_file = {}
+    for (file_index, row_index), row in tagged:
+        by_file.setdefault(file_index, []).append((row_index, row))
+    for file_index, path in enumerate(paths):
+        rows = read_csv(path)[1:]
+        assert by_file[file_index] == list(enumerate(rows))
+
+
+def test_unfinished_read_does_not_block_exit(android_csv):
+    script = (
+        'from app_profiles import read_concurrently\n'
+        'header, rows = read_concurrently([{!r}] * 3, queue_size=2, '
+        'batch_size=100)\n'
+        'for row in rows:\n'
+        '    break\n').format(android_csv)
+    subprocess.run([sys.executable, '-c', script], check=True, timeout=30,
+                   cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+def test_close_stops_the_readers(android_csv):
+    _, rows = read_concurrently([android_csv] * 3, queue_size=2,
+                                batch_size=100)
+    next(rows)
+    rows.close()
+    assert list(rows) == []
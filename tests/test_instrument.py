@@ -0,0 +1,58 @@
+import pytest
+
+from app_profiles import Instrumentation, clean_android, instrumentation
+from conftest import BAD_ANDROID, read_csv
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable(trace_memory=False)
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_pipeline_stages_count_rows(android_csv, android_serial, enabled):
+    list(clean_android(android_csv)[1])
+    records = {record['name']: record for record in enabled.report()}
+    assert set(records) == {'load', 'validate', 'language filter', 'dedup',
+                            'price filter'}
+    # the header is one of the rows read
+    n_rows = len(read_csv(android_csv)) - 1
+    assert records['load']['rows_out'] == n_rows + 1
+    assert records['validate']['rows_out'] == n_rows - len(BAD_ANDROID)
+    assert records['price filter']['rows_out'] == len(android_serial[1])
+    for record in records.values():
+        assert record['calls'] == 1
+        assert record['seconds'] >= 0
+        assert record['allocated_bytes'] is None
+
+
+def test_disabled_records_nothing(android_csv):
+    assert not instrumentation.enabled
+    instrumentation.reset()
+    list(clean_android(android_csv)[1])
+    with instrumentation.stage('block', rows_in=3) as stage:
+        stage.rows_out = 1
+    assert instrumentation.report() == []
+
+
+def test_stage_times_blocks_and_memory():
+    profiler = Instrumentation(enabled=True)
+    try:
+        with profiler.stage('outer', rows_in=2) as outer:
+            with profiler.stage('inner'):
+                data = [0] * 100000
+            outer.rows_out = len(data)
+        assert list(profiler.watch('rows', iter('abc'), rows_in=3)) == [
+            'a', 'b', 'c']
+    finally:
+        profiler.disable()
+    records = {record['name']: record for record in profiler.report()}
+    assert records['outer']['rows_in'] == 2
+    assert records['outer']['rows_out'] == 100000
+    assert records['inner']['allocated_bytes'] >= 800000
+    assert records['outer']['peak_bytes'] >= records['inner']['peak_bytes']
+    assert records['rows']['calls'] == 1
+    assert records['rows']['rows_out'] == 3
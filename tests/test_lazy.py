@@ -0,0 +1,42 @@
+import pytest
+
+from app_profiles import LazyDataset, clean_plan
+from app_profiles.lazy import _Dedup, english, equals, free
+
+
+@pytest.mark.parametrize('store', ['android', 'ios'])
+def test_clean_plan_matches_serial(store, request):
+    path = request.getfixturevalue(store + '_csv')
+    _, rows = request.getfixturevalue(store + '_serial')
+    assert clean_plan(path, store).collect() == rows
+
+
+def test_cheapest_filter_runs_first(android_csv):
+    plan = clean_plan(android_csv, 'android').plan()
+    # both filters only read the name or the price, but only the name is
+    # the de-duplication key, so only is_english moves below it
+    assert [type(stage) for stage in plan] == [list, _Dedup, list]
+    assert [predicate.name for predicate in plan[0]] == ['english[0]']
+    assert [predicate.name for predicate in plan[2]] == ['free[7]']
+
+    dataset = LazyDataset([]).filter(english(0)).filter(free(7))
+    assert [predicate.cost for predicate in dataset.plan()[0]] == [1, 10]
+
+
+def test_pushed_down_filter_gives_same_rows(android_serial):
+    header, rows = android_serial
+    name = rows[0][0]
+    rows = rows + [[name] + rows[0][1:3] + ['99999999'] + rows[0][4:]]
+    dataset = LazyDataset(rows, header).deduplicate(0, 3).filter(
+        equals(0, name))
+    assert isinstance(dataset.plan()[0], list)
+    assert dataset.collect() == [rows[-1]]
+
+
+def test_select_then_filter_uses_projected_positions(android_serial):
+    header, rows = android_serial
+    dataset = LazyDataset(rows, header).select([0, 1]).filter(
+        equals(1, 'GAME'))
+    assert dataset.header == ['App', 'Category']
+    assert dataset.collect() == [[row[0], row[1]] for row in rows
+                                 if row[1] == 'GAME']
@@ -0,0 +1,37 @@
+from app_profiles import clean_android, clean_ios, deduplicate
+from conftest import (
+    BAD_ANDROID,
+    BAD_IOS,
+    notebook_android,
+    notebook_ios,
+    read_csv,
+)
+
+
+def test_clean_android_matches_notebook(android_csv, android_serial):
+    header, *rows = read_csv(android_csv)
+    good = [row for row in rows if row not in BAD_ANDROID]
+    assert android_serial == (header, notebook_android(good))
+
+
+def test_clean_ios_matches_notebook(ios_csv, ios_serial):
+    header, *rows = read_csv(ios_csv)
+    good = [row for row in rows if row not in BAD_IOS]
+    assert ios_serial == (header, notebook_ios(good))
+
+
+def test_clean_rejects_bad_rows(android_csv, ios_csv):
+    bad_rows = []
+    list(clean_android(android_csv, bad_rows=bad_rows)[1])
+    assert bad_rows == BAD_ANDROID
+    bad_rows = []
+    list(clean_ios(ios_csv, bad_rows=bad_rows)[1])
+    assert bad_rows == BAD_IOS
+
+
+def test_deduplicate_keeps_first_most_reviewed():
+    rows = [['a', '1'], ['b', '5'], ['a', '3'], ['a', '3'], ['c', '0']]
+    unique_rows, duplicates = deduplicate(rows, 0, keep_by=1)
+    assert unique_rows == [['b', '5'], ['a', '3'], ['c', '0']]
+    assert unique_rows[1] is rows[2]
+    assert duplicates == ['a', 'a']
@@ -0,0 +1,47 @@
+from app_profiles import NameIndex, match_apps, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name('Instagram™ – Photos & Vidéo!') == (
+        'instagram photos video')
+
+
+def test_punctuation_inside_a_word_separates_tokens():
+    assert normalize_name('Facebook-Messenger') == 'facebook messenger'
+    assert normalize_name('Candy.Crush/Saga') == 'candy crush saga'
+    assert match_apps([['Facebook Messenger']],
+                      [['1', 'Facebook-Messenger']]) == [(0, 0, 1.0)]
+
+
+def test_prefix_filter_finds_pairs_sharing_frequent_tokens():
+    # a2 and b2 are the rarest tokens, but only lead to a poor match
+    index = NameIndex(['a2 b2 z', 'a1 b1 c d e f g h', 'c d e f g h qN'])
+    assert index.best_match('a2 b2 c d e f g h', threshold=0.5) == (
+        2, 2 / 3)
+
+
+def test_names_made_of_frequent_tokens():
+    names = ['Music Player Free'] + ['Free Music Player {}'.format(number)
+                                     for number in range(5)]
+    index = NameIndex(names, max_posting=2)
+    assert index.best_match('Free Music Player') == (0, 1.0)
+    assert index.best_match('Player Free Music Lite') == (0, 0.75)
+
+
+def test_prefix_filter_matches_brute_force(android_serial, ios_serial):
+    android = [row[0] for row in android_serial[1]][:300]
+    ios = [row[1] for row in ios_serial[1]][:300]
+    threshold = 0.5
+    expected = []
+    tokens = [frozenset(normalize_name(name).split()) for name in ios]
+    for row_id, name in enumerate(android):
+        mine = frozenset(normalize_name(name).split())
+        scores = [(len(mine & other) / len(mine | other), -ios_id)
+                  for ios_id, other in enumerate(tokens) if mine | other]
+        score, ios_id = max(scores)
+        if score >= threshold:
+            expected.append((row_id, -ios_id, score))
+    matches = match_apps([[name] for name in android],
+                         [[None, name] for name in ios],
+                         threshold=threshold, max_posting=len(ios))
+    assert matches == expected
@@ -0,0 +1,37 @@
+from app_profiles import (
+    ANDROID_SCHEMA,
+    AppTable,
+    freq_table,
+    group_aggregate,
+    parse_installs,
+    result_cache,
+)
+
+
+def test_lists_are_never_stale():
+    data = [['a', 'X'], ['b', 'Y']]
+    assert freq_table(data, 1) == {'X': 50.0, 'Y': 50.0}
+    data[0][1] = 'Y'
+    assert freq_table(data, 1) == {'Y': 100.0}
+
+
+def test_tables_are_cached_per_version(android_serial):
+    header, rows = android_serial
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    result_cache.invalidate()
+    hits = result_cache.hits
+    first = freq_table(table, 'Category')
+    assert freq_table(table, 1) == first
+    assert result_cache.hits == hits + 1
+
+    # results handed out are copies
+    first['GAME'] = -1.0
+    assert freq_table(table, 'Category')['GAME'] != -1.0
+
+    table.column('Category').codes[0] = table.column(
+        'Category').categories.index('GAME')
+    table.touch()
+    assert freq_table(table, 'Category') == freq_table(list(table), 1)
+    installs = lambda row: parse_installs(row[5])
+    assert group_aggregate(table, 'Category', 'n_installs') == (
+        group_aggregate(list(table), 1, installs))
@@ -0,0 +1,12 @@
+import importlib
+import types
+
+import app_profiles
+
+
+def test_exports_resolve_after_their_modules_are_imported():
+    for module in app_profiles._EXPORTS:
+        importlib.import_module(module)
+    for name in app_profiles.__all__:
+        value = getattr(app_profiles, name)
+        assert not isinstance(value, types.ModuleType), name
@@ -0,0 +1,45 @@
+from collections import Counter
+
+import pytest
+
+from app_profiles import profile_parallel
+from app_profiles.parallel import chunk_ranges
+
+
+def first_seen_counts(rows, column):
+    counts = Counter(row[column] for row in rows)
+    return [(value, counts[value])
+            for value in dict.fromkeys(row[column] for row in rows)]
+
+
+def test_chunk_ranges_start_at_lines(android_csv):
+    header_end, ranges = chunk_ranges(android_csv, 16)
+    with open(android_csv, 'rb') as opened_file:
+        data = opened_file.read()
+    assert ranges[0][0] == header_end
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1:start] == b'\n'
+
+
+@pytest.mark.parametrize('store, columns', [('android', (1, 9)),
+                                            ('ios', (11,))])
+def test_profile_parallel_matches_serial(store, columns, request):
+    path = request.getfixturevalue(store + '_csv')
+    header, rows = request.getfixturevalue(store + '_serial')
+    # many small chunks, so duplicates of an app land in different ones
+    parallel_header, parallel_rows, counts = profile_parallel(
+        path, store, columns, workers=3)
+    assert parallel_header == header
+    assert parallel_rows == rows
+    for column in columns:
+        assert list(counts[column].items()) == first_seen_counts(rows, column)
+
+
+def test_counts_without_rows(android_csv, android_serial):
+    _, rows = android_serial
+    _, no_rows, counts = profile_parallel(android_csv, 'android', (1,),
+                                          workers=2, keep_rows=False)
+    assert no_rows is None
+    assert list(counts[1].items()) == first_seen_counts(rows, 1)
@@ -0,0 +1,30 @@
+import math
+
+from app_profiles import (
+    parse_column,
+    parse_installs,
+    parse_price,
+    price_equals,
+)
+
+
+def test_parsers():
+    assert parse_installs('1,000,000+') == 1000000.0
+    assert parse_installs('0') == 0.0
+    assert parse_price('$4.99') == 4.99
+    assert parse_price('0.0') == parse_price('0') == 0.0
+    assert price_equals('$0', 0.0)
+    assert not price_equals('Everyone', 0.0)
+
+
+def test_parse_column_reports_bad_values():
+    bad_values = []
+    parsed = parse_column(['1.5', 'n/a', '3'], float, 'd', 'value',
+                          bad_values)
+    assert parsed.typecode == 'd'
+    assert parsed[0] == 1.5 and math.isnan(parsed[1]) and parsed[2] == 3.0
+    assert bad_values == [(1, 'value', 'n/a')]
+
+    bad_values = []
+    assert list(parse_column(['1', '2'], int, 'q', 'n', bad_values)) == [1, 2]
+    assert bad_values == []
@@ -0,0 +1,57 @@
+import math
+import random
+
+from app_profiles import KLLSketch, display_table, group_quantiles
+
+
+def true_quantile(ordered, fraction):
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def rank_error(ordered, value, fraction):
+    low = ordered.index(value) / len(ordered)
+    high = (len(ordered) - ordered[::-1].index(value)) / len(ordered)
+    if low <= fraction <= high:
+        return 0
+    return min(abs(fraction - low), abs(fraction - high))
+
+
+def test_kll_is_exact_below_capacity():
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(200)]
+    sketch = KLLSketch(k=200, seed=0)
+    for value in values:
+        sketch.update(value)
+    ordered = sorted(values)
+    fractions = [0.1, 0.25, 0.5, 0.75, 0.9]
+    assert sketch.quantiles(fractions) == [true_quantile(ordered, fraction)
+                                           for fraction in fractions]
+
+
+def test_kll_rank_error():
+    rng = random.Random(0)
+    values = [int(rng.paretovariate(1.2)) for _ in range(20000)]
+    first, second = KLLSketch(k=200, seed=0), KLLSketch(k=200, seed=1)
+    for position, value in enumerate(values):
+        (first if position % 3 else second).update(value)
+    first.merge(second)
+    assert first.n == len(values)
+    assert first.size < len(values) / 10
+    ordered = sorted(values)
+    for fraction in (0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+        assert rank_error(ordered, first.quantile(fraction), fraction) < 0.02
+
+
+def test_group_quantiles_skips_missing_values():
+    rows = [['a', '1'], ['a', '3'], ['a', 'x'], ['b', '2']]
+    value = lambda row: float(row[1]) if row[1] != 'x' else None
+    assert group_quantiles(rows, 0, value, fractions=(0.5,)) == {
+        'a': {0.5: 1.0}, 'b': {0.5: 2.0}}
+
+
+def test_display_table_top_matches_full_ranking(android_serial, capsys):
+    _, rows = android_serial
+    display_table(rows, 1)
+    ranking = capsys.readouterr().out.splitlines()
+    display_table(rows, 1, top=5)
+    assert capsys.readouterr().out.splitlines() == ranking[:5]
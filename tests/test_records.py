@@ -0,0 +1,51 @@
+import pickle
+
+import pytest
+
+from app_profiles import (
+    AndroidApp,
+    IosApp,
+    as_records,
+    deduplicate,
+    freq_table,
+)
+
+
+def test_records_read_like_rows(android_serial, ios_serial):
+    for (_, rows), record_type in ((android_serial, AndroidApp),
+                                   (ios_serial, IosApp)):
+        records = list(as_records(rows, record_type))
+        assert records == rows
+        assert [list(record) for record in records] == rows
+        record, row = records[0], rows[0]
+        assert record[-5] == row[-5]
+        assert record[1:4] == row[1:4]
+        assert len(record) == len(row)
+        assert not hasattr(record, '__dict__')
+        assert freq_table(records, -5) == freq_table(rows, -5)
+
+
+def test_repeated_fields_are_shared(android_serial):
+    _, rows = android_serial
+    # equal strings that are separate objects, as csv.reader gives them
+    copy = [value.encode().decode() for value in rows[0]]
+    assert copy[1] is not rows[0][1]
+    first, second = as_records([rows[0], copy], AndroidApp)
+    assert first.category is second.category
+    assert first.installs is second.installs
+    assert first.name is not second.name
+
+
+def test_deduplicate_records():
+    rows = [['a', 'GAME', '4.0', '1'], ['a', 'GAME', '4.0', '3']]
+    rows = [row + [''] * 9 for row in rows]
+    records = list(as_records(rows, AndroidApp))
+    assert deduplicate(records, 0, keep_by=3)[0] == [rows[1]]
+
+
+def test_records_pickle_and_check_length(ios_serial):
+    record = IosApp.from_row(ios_serial[1][0])
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert repr(record).startswith('IosApp(id=')
+    with pytest.raises(ValueError):
+        IosApp('1', 'too short')
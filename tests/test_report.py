@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from app_profiles import AppTable, Report
+from app_profiles.analysis import drill_down
+
+
+@pytest.fixture
+def report():
+    report = Report()
+    report.add('ios', 'apps', 3)
+    report.add('ios', 'prime_genre', {'Games': 66.7, 'Music': 33.3})
+    report.add('ios', 'ratings', {'Games': {'count': 2, 'mean': 15.5}})
+    report.add('ios', 'top apps', [('A|B', 20), ('C', 11)],
+               columns=('name', 'ratings'))
+    return report
+
+
+def write(report, format):
+    out = io.StringIO()
+    assert report.write(out, format) == [out]
+    return out.getvalue()
+
+
+def test_text(report):
+    assert write(report, 'text') == (
+        'ios apps: 3\n'
+        '\nios prime_genre\nGames : 66.7\nMusic : 33.3\n'
+        '\nios ratings\nGames : 2 : 15.5\n'
+        '\nios top apps\nA|B : 20\nC : 11\n')
+
+
+def test_markdown(report):
+    assert write(report, 'markdown') == (
+        '**ios apps:** 3\n\n'
+        '## ios prime_genre\n\n| prime_genre | value |\n| --- | --- |\n'
+        '| Games | 66.7 |\n| Music | 33.3 |\n\n'
+        '## ios ratings\n\n| ratings | count | mean |\n'
+        '| --- | --- | --- |\n| Games | 2 | 15.5 |\n\n'
+        '## ios top apps\n\n| name | ratings |\n| --- | --- |\n'
+        '| A\\|B | 20 |\n| C | 11 |\n\n')
+
+
+def test_json_round_trips(report, tmp_path):
+    path = str(tmp_path / 'report.json')
+    assert report.write(path, 'json') == [path]
+    with open(path, encoding='utf8') as opened_file:
+        results = json.load(opened_file)
+    assert results['ios']['prime_genre'] == {'Games': 66.7, 'Music': 33.3}
+    assert results['ios']['top apps'] == [['A|B', 20], ['C', 11]]
+    assert Report.from_results(results).to_dict() == results
+
+
+def test_csv_writes_a_file_per_section(report, tmp_path):
+    directory = str(tmp_path / 'csv')
+    paths = report.write(directory, 'csv')
+    assert [os.path.basename(path) for path in paths] == [
+        'ios_apps.csv', 'ios_prime_genre.csv', 'ios_ratings.csv',
+        'ios_top_apps.csv']
+    with open(paths[2], encoding='utf8', newline='') as opened_file:
+        assert list(csv.reader(opened_file)) == [
+            ['ratings', 'count', 'mean'], ['Games', '2', '15.5']]
+
+
+def test_unknown_format(report):
+    with pytest.raises(ValueError):
+        report.write(io.StringIO(), 'xml')
+
+
+def test_drill_down_keeps_apps_with_the_same_name():
+    rows = [['1', 'Solitaire', 'Games', '50'],
+            ['2', 'Chess', 'Games', '70'],
+            ['3', 'Solitaire', 'Games', '20'],
+            ['4', 'Piano', 'Music', '90']]
+    table = AppTable.from_rows(
+        ['id', 'track_name', 'prime_genre', 'rating_count_tot'], rows,
+        {'categorical': ('prime_genre',),
+         'numeric': {'rating_count_tot': (int, 'q')}})
+    drilled = drill_down(table, 'prime_genre', 'Games', 'track_name',
+                         'rating_count_tot')
+    assert drilled == [('Chess', 70), ('Solitaire', 50), ('Solitaire', 20)]
+    assert drill_down(table, 'prime_genre', 'Games', 'track_name',
+                      'rating_count_tot', top=2) == drilled[:2]
+
+    report = Report()
+    report.add('ios', 'ratings_in_Games', drilled)
+    assert write(report, 'markdown').count('| Solitaire |') == 2
+    assert '| ratings_in_Games | value |' in write(report, 'markdown')
@@ -0,0 +1,53 @@
+from statistics import median
+
+import pytest
+
+from app_profiles import (
+    ANDROID_SCHEMA,
+    AppTable,
+    parse_installs,
+    popularity,
+    summarize,
+)
+
+
+def test_summarize_fences():
+    stats = summarize([1, 2, 3, 4, 5, 6, 7, 8, 100])
+    assert stats['median'] == 5
+    assert (stats['q1'], stats['q3'], stats['iqr']) == (3, 7, 4)
+    assert (stats['lower_fence'], stats['upper_fence']) == (-9, 19)
+    assert stats['mad'] == 2
+    assert stats['outliers'] == 1
+    assert stats['robust_mean'] == 4.5
+    assert stats['mean'] == pytest.approx(136 / 9)
+    # an even number of values has the mean of the middle two as median
+    assert summarize([1, 2, 3, 10])['median'] == 2.5
+
+
+def test_outlier_names_largest_first():
+    rows = [['app{}'.format(number), 'X', str(number)]
+            for number in range(1, 9)]
+    rows += [['Giant', 'X', '500'], ['Huge', 'X', '90'], ['Alone', 'Y', '1']]
+    groups = popularity(rows, 1, lambda row: float(row[2]), name_index=0)
+    assert groups['X']['outlier_names'] == ['Giant', 'Huge']
+    assert groups['X']['robust_mean'] == 4.5
+    assert groups['Y']['outlier_names'] == []
+
+
+def test_matches_plain_statistics(android_serial):
+    header, rows = android_serial
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    groups = popularity(table, 'Category', 'n_installs', name_index='App')
+    for category, stats in groups.items():
+        values = [parse_installs(row[5]) for row in rows
+                  if row[1] == category]
+        assert stats['count'] == len(values)
+        assert stats['median'] == median(values)
+        assert len(stats['outlier_names']) == stats['outliers']
+
+
+def test_unparsed_values_are_skipped():
+    rows = [['X', '10'], ['X', 'n/a'], ['X', '30']]
+    table = AppTable.from_rows(['key', 'value'], rows,
+                               {'numeric': {'value': (float, 'd')}})
+    assert popularity(table, 'key', 'value')['X']['count'] == 2
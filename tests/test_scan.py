@@ -0,0 +1,62 @@
+import pytest
+
+from app_profiles import (
+    ANDROID_COLUMNS,
+    IOS_COLUMNS,
+    scan_csv,
+    split_header,
+    stream_rows,
+)
+from conftest import write_csv
+
+
+def projected_rows(path, columns):
+    header, rows = split_header(stream_rows(path))
+    positions = [header.index(name) for name in columns]
+    kept, bad_rows = [], []
+    for row in rows:
+        if len(row) == len(header):
+            kept.append([row[position] for position in positions])
+        else:
+            bad_rows.append(row)
+    return kept, bad_rows
+
+
+@pytest.mark.parametrize('chunk_size', [64, 1 << 20])
+@pytest.mark.parametrize('store, columns', [('android', ANDROID_COLUMNS),
+                                            ('ios', IOS_COLUMNS)])
+def test_scan_matches_csv_reader(store, columns, chunk_size, request):
+    path = request.getfixturevalue(store + '_csv')
+    bad_rows = []
+    names, rows = scan_csv(path, columns, bad_rows=bad_rows,
+                           chunk_size=chunk_size)
+    assert names == list(columns)
+    assert (list(rows), bad_rows) == projected_rows(path, columns)
+
+
+@pytest.mark.parametrize('chunk_size', [16, 1 << 20])
+def test_quoted_records(tmp_path, chunk_size):
+    rows = [['name', 'n', 'genre']]
+    for number in range(50):
+        rows.append(['plain {}'.format(number), str(number), 'x'])
+        if number % 7 == 0:
+            rows.append(['with, comma', '"quoted"', 'two\nlines'])
+        if number % 11 == 0:
+            rows.append(['crlf\r\ninside', '', 'lone\rbreak'])
+    rows.append(['short', 'row'])
+    path = write_csv(tmp_path / 'quoted.csv', rows)
+    bad_rows = []
+    _, scanned = scan_csv(path, ['genre', 'name'], bad_rows=bad_rows,
+                          chunk_size=chunk_size)
+    assert (list(scanned), bad_rows) == projected_rows(path,
+                                                       ['genre', 'name'])
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_bytes(b'')
+    with pytest.raises(ValueError, match='empty'):
+        scan_csv(str(path), ['App'])
+    path.write_bytes(b'App,Category\r\n')
+    names, rows = scan_csv(str(path), ['Category'])
+    assert (names, list(rows)) == (['Category'], [])
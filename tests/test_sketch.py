@@ -0,0 +1,73 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app_profiles import (
+    ApproximateCounter,
+    CountMinSketch,
+    HyperLogLog,
+    freq_table,
+)
+
+
+@pytest.fixture(scope='module')
+def values():
+    rng = random.Random(0)
+    return [int(rng.paretovariate(1.2)) for _ in range(20000)]
+
+
+def test_count_min_never_undercounts(values):
+    sketch = CountMinSketch(epsilon=0.001, delta=0.01)
+    for value in values:
+        sketch.add(value)
+    counts = Counter(values)
+    errors = [sketch.estimate(value) - count
+              for value, count in counts.items()]
+    assert min(errors) >= 0
+    assert max(errors) <= 0.001 * len(values)
+
+
+def test_count_min_merge_matches_one_sketch(values):
+    whole = CountMinSketch()
+    first, second = CountMinSketch(), CountMinSketch()
+    for position, value in enumerate(values):
+        whole.add(value)
+        (first if position % 2 else second).add(value)
+    first.merge(second)
+    assert first.rows == whole.rows
+    assert first.total == whole.total
+
+
+def test_hyperloglog_error():
+    sketch = HyperLogLog(precision=14)
+    for value in range(50000):
+        sketch.add(value)
+    # relative standard error ~ 1.04 / sqrt(2 ** 14) = 0.8%
+    assert sketch.count() == pytest.approx(50000, rel=0.04)
+
+    small = HyperLogLog(precision=14)
+    for value in range(100):
+        small.add(value)
+    assert small.count() == pytest.approx(100, abs=2)
+
+
+def test_hyperloglog_merge_is_union():
+    first, second, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    for value in range(3000):
+        (first if value < 2000 else second).add(value)
+        union.add(value)
+    second.add(5)
+    first.merge(second)
+    assert first.registers == union.registers
+
+
+def test_approximate_freq_table(android_serial):
+    _, rows = android_serial
+    exact = freq_table(rows, 1)
+    approximate = freq_table(rows, 1, approximate=True)
+    assert set(approximate) == set(exact)
+    for value, percentage in approximate.items():
+        assert exact[value] <= percentage <= exact[value] + 0.1
+    counter = ApproximateCounter().update(row[1] for row in rows)
+    assert counter.distinct_count() == pytest.approx(len(exact), abs=1)
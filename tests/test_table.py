@@ -0,0 +1,37 @@
+from app_profiles import (
+    ANDROID_SCHEMA,
+    IOS_SCHEMA,
+    AppTable,
+    freq_table,
+    parse_installs,
+)
+
+
+def test_rows_read_back_unchanged(android_serial, ios_serial):
+    for (header, rows), schema in ((android_serial, ANDROID_SCHEMA),
+                                   (ios_serial, IOS_SCHEMA)):
+        table = AppTable.from_rows(header, rows, schema)
+        assert len(table) == len(rows)
+        assert list(table) == rows
+        assert table[-1] == rows[-1]
+        assert table[2:5] == rows[2:5]
+
+
+def test_columns_are_parsed_once(android_serial):
+    header, rows = android_serial
+    table = AppTable.from_rows(header, rows, ANDROID_SCHEMA)
+    assert list(table.column('Reviews')) == [int(row[3]) for row in rows]
+    assert list(table.column('n_installs')) == [
+        parse_installs(row[5]) for row in rows]
+    assert table.column(1).codes.typecode == 'i'
+    for column in ('Category', 'Genres'):
+        assert freq_table(table, column) == freq_table(
+            rows, header.index(column))
+
+
+def test_bad_values_are_kept():
+    rows = [['a', '10'], ['b', 'many'], ['c', '30']]
+    table = AppTable.from_rows(['name', 'value'], rows,
+                               {'numeric': {'value': (float, 'd')}})
+    assert table.bad_values == {('value', 1): 'many'}
+    assert list(table) == [['a', '10.0'], ['b', 'many'], ['c', '30.0']]
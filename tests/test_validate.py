@@ -0,0 +1,52 @@
+import pytest
+
+from app_profiles import Quarantine, android_rules, validate_rows
+from conftest import read_csv
+
+
+def check_one_by_one(rows, header, rules):
+    """Row-at-a-time reference: ``(kept rows, {row number: reason})``."""
+    positions = {name: position for position, name in enumerate(header)}
+    kept, rejected = [], {}
+    for number, row in enumerate(rows):
+        if len(row) != len(header):
+            rejected[number] = 'expected {} fields, got {}'.format(
+                len(header), len(row))
+            continue
+        reasons = [rule.test(row[positions[rule.column]]) for rule in rules]
+        reasons = [reason for reason in reasons if reason is not None]
+        if reasons:
+            rejected[number] = '; '.join(reasons)
+        else:
+            kept.append(row)
+    return kept, rejected
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 256])
+def test_batches_match_row_by_row(android_csv, tmp_path, batch_size):
+    header, *rows = read_csv(android_csv)
+    rows[10][2] = 'NaN'
+    rows[11][3] = '12.5'
+    rows[12][5] = 'Varies'
+    rows[13][7] = '-$1'
+    expected_rows, expected_rejected = check_one_by_one(rows, header,
+                                                        android_rules())
+
+    bad_rows = []
+    path = tmp_path / 'quarantine.csv'
+    with Quarantine(str(path)) as quarantine:
+        kept = list(validate_rows(rows, header, android_rules(), bad_rows,
+                                  quarantine, batch_size=batch_size))
+    assert kept == expected_rows
+    quarantined = read_csv(path)
+    assert quarantined[0] == ['row', 'reason']
+    assert {int(line[0]): line[1] for line in quarantined[1:]} == (
+        expected_rejected)
+    assert [line[2:] for line in quarantined[1:]] == bad_rows
+    assert bad_rows == [rows[number] for number in expected_rejected]
+    assert 10 not in expected_rejected
+
+
+def test_unknown_column():
+    with pytest.raises(ValueError):
+        list(validate_rows([], ['App'], android_rules()))